@@ -1,50 +1,81 @@
-from typing import List
+from __future__ import annotations
 
-import utils.io
+from dataclasses import dataclass
 
-VALUE_a = 1
-VALUE_A = 27
+import utils.conversions
+import utils.lazy
 
+np = utils.lazy.lazy_import("numpy")
+
+# Priorities are 1 to 52
+N_PRIORITIES = 53
 
-def get_char_value(c: str):
-    if c.islower():
-        return ord(c) - ord("a") + VALUE_a
-    else:
-        return ord(c) - ord("A") + VALUE_A
 
+@dataclass
+class Items:
+    """All items of all packs, in file order"""
 
-def pack_priority(pack: List[str]):
-    n_items_per_half = len(pack) // 2
-    first = pack[:n_items_per_half]
-    second = pack[n_items_per_half:]
+    # Priority of each item
+    priorities: np.ndarray
+    # Index of pack of each item
+    pack_ids: np.ndarray
+    # Position of each item in its pack
+    positions: np.ndarray
+    n_packs: int
 
-    common_item = list(set(first).intersection(set(second)))[0]
 
-    return get_char_value(common_item)
+def parse_items(input_file: str) -> Items:
+    # Raw bytes go through the priority table at once, instead of each char being converted
+    buffer = np.fromfile(input_file, dtype=np.uint8)
+    line_ends = buffer == ord("\n")
+    is_item = ~line_ends & (buffer != ord("\r"))
 
+    # Empty lines are not packs
+    line_ids = (np.cumsum(line_ends) - line_ends)[is_item]
+    __, pack_ids = np.unique(line_ids, return_inverse=True)
+    pack_sizes = np.bincount(pack_ids)
+    pack_starts = np.cumsum(pack_sizes) - pack_sizes
 
-def group_packs(packs: List[List[str]], group_size) -> List[List[List[str]]]:
-    return zip(*[iter(packs)] * group_size)
+    priorities = utils.conversions.decode_bytes(buffer[is_item], utils.conversions.priority_table())
+    positions = np.arange(len(pack_ids)) - pack_starts[pack_ids]
+    return Items(priorities, pack_ids, positions, len(pack_sizes))
 
 
-def pack_group_priority(pack_group: List[List[str]]):
-    group_set = set(pack_group[0])
-    for pack in pack_group[1:]:
-        group_set = group_set.intersection(set(pack))
-    badge = list(group_set)[0]
-    return get_char_value(badge)
+def item_presence(items: Items, selected: np.ndarray = None) -> np.ndarray:
+    """(n_packs, N_PRIORITIES) bool array telling which priorities (optionally among selected items) each
+    pack holds
+    """
+    presence = np.zeros((items.n_packs, N_PRIORITIES), dtype=bool)
+    if selected is None:
+        presence[items.pack_ids, items.priorities] = True
+    else:
+        presence[items.pack_ids[selected], items.priorities[selected]] = True
+    return presence
 
 
-def solve_part_1(input_file: str) -> int:
-    packs = utils.io.read_file_lines(input_file)
+def pack_priorities(items: Items) -> np.ndarray:
+    """Priority of the item found in both halves of each pack"""
+    pack_sizes = np.bincount(items.pack_ids, minlength=items.n_packs)
+    in_first_half = items.positions < pack_sizes[items.pack_ids] // 2
+    common = item_presence(items, in_first_half) & item_presence(items, ~in_first_half)
+    return common.argmax(axis=1)
 
-    return sum([pack_priority(pack) for pack in packs])
+
+def pack_group_priorities(items: Items, group_size: int) -> np.ndarray:
+    """Priority of the badge, i.e. the item found in all packs of each group"""
+    presence = item_presence(items)
+    common = presence.reshape(-1, group_size, N_PRIORITIES).all(axis=1)
+    return common.argmax(axis=1)
+
+
+def solve_part_1(input_file: str) -> int:
+    items = parse_items(input_file)
+    return int(pack_priorities(items).sum())
 
 
 def solve_part_2(input_file: str) -> int:
-    packs = utils.io.read_file_lines(input_file)
-    pack_groups = group_packs(packs, 3)
-    return sum([pack_group_priority(group) for group in pack_groups])
+    items = parse_items(input_file)
+    return int(pack_group_priorities(items, 3).sum())
 
 
 if __name__ == "__main__":
@@ -1,40 +1,41 @@
-import re
-from typing import Callable, List
+from __future__ import annotations
 
-from interval import Interval
+from typing import Callable, Tuple
 
+import utils.intervals
 import utils.io
+import utils.lazy
 
-PAIR_REGEX = "(\d+)\-(\d+)\,(\d+)\-(\d+)"
+np = utils.lazy.lazy_import("numpy")
+IntervalArray = utils.intervals.IntervalArray
 
+PAIR_REGEX = rb"(\d+)\-(\d+)\,(\d+)\-(\d+)"
 
-def parse_input_to_intervals(input_file: str):
-    pairs = utils.io.read_file_lines(input_file)
 
-    matches = [re.match(PAIR_REGEX, pair) for pair in pairs]
-    first_intervals = [Interval(int(m.group(1)), int(m.group(2))) for m in matches]
-    second_intervals = [Interval(int(m.group(3)), int(m.group(4))) for m in matches]
-    return first_intervals, second_intervals
+def parse_input_to_intervals(input_file: str) -> Tuple[IntervalArray, IntervalArray]:
+    pairs = np.array(list(utils.io.scan_file(input_file, PAIR_REGEX, convert=int)), dtype=np.int64)
+    pairs = pairs.reshape(-1, 4)
+    return IntervalArray(pairs[:, 0], pairs[:, 1]), IntervalArray(pairs[:, 2], pairs[:, 3])
 
 
 def check_intervals(
-    intervals_1: List[Interval],
-    intervals_2: List[Interval],
-    predicate: Callable[[Interval, Interval], bool],
-) -> List[bool]:
-    return [predicate(f, s) for (f, s) in zip(intervals_1, intervals_2)]
+    intervals_1: IntervalArray,
+    intervals_2: IntervalArray,
+    predicate: Callable[[IntervalArray, IntervalArray], np.ndarray],
+) -> np.ndarray:
+    return predicate(intervals_1, intervals_2)
 
 
-def count_full_overlapping_pairs(intervals_1: List[Interval], intervals_2: List[Interval]) -> int:
-    have_full_overlap = check_intervals(intervals_1, intervals_2, lambda x, y: (x in y) or (y in x))
-    return sum(have_full_overlap)
+def count_full_overlapping_pairs(intervals_1: IntervalArray, intervals_2: IntervalArray) -> int:
+    have_full_overlap = check_intervals(
+        intervals_1, intervals_2, lambda x, y: y.contains(x) | x.contains(y)
+    )
+    return int(have_full_overlap.sum())
 
 
-def count_partial_overlapping_pairs(
-    intervals_1: List[Interval], intervals_2: List[Interval]
-) -> int:
+def count_partial_overlapping_pairs(intervals_1: IntervalArray, intervals_2: IntervalArray) -> int:
     have_partial_overlap = check_intervals(intervals_1, intervals_2, lambda x, y: x.overlaps(y))
-    return sum(have_partial_overlap)
+    return int(have_partial_overlap.sum())
 
 
 def solve_part_1(input_file: str) -> int:
@@ -7,6 +7,8 @@ from typing import List, Tuple
 
 import utils.io
 
+OPERATION_REGEX = re.compile(rb"^move (\d+) from (\d+) to (\d+)", re.MULTILINE)
+
 
 class CraneModel(Enum):
     CrateMover_9000 = 0
@@ -16,18 +18,12 @@ class CraneModel(Enum):
 def parse_input(input_file: str):
     data = utils.io.read_file_lines(input_file)
 
-    stacks = []
-    operations = []
-
-    operation_regex = "move (\d+) from (\d+) to (\d+)"
+    operations = list(utils.io.scan_file(input_file, OPERATION_REGEX, convert=int))
 
     stacks = None
     for line in data:
-        m = re.match(operation_regex, line)
-        if m is not None:
-            operations.append((int(m.group(1)), int(m.group(2)), int(m.group(3))))
-        elif "[" not in line:
-            # Can skip as info is redundant
+        if "[" not in line:
+            # Can skip as info is redundant (or operation, already parsed)
             continue
         else:
             # Split line in groups of 3 chars split by a space
@@ -78,7 +74,7 @@ def solve_part_2(input_file: str) -> int:
 
 if __name__ == "__main__":
     print("Part I")
-    print(solve_part_1("input/day5.txt"))
+    print(solve_part_1("input/day05.txt"))
 
     print("Part II")
-    print(solve_part_2("input/day5.txt"))
+    print(solve_part_2("input/day05.txt"))
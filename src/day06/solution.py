@@ -31,7 +31,7 @@ def solve_part_2(input_file: str) -> int:
 
 if __name__ == "__main__":
     print("Part I")
-    print(solve_part_1("input/day6.txt"))
+    print(solve_part_1("input/day06.txt"))
 
     print("Part II")
-    print(solve_part_2("input/day6.txt"))
+    print(solve_part_2("input/day06.txt"))
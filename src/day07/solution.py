@@ -7,6 +7,9 @@ import anytree
 
 import utils.io
 
+FILE_INFO_REGEX = re.compile(r"(\d+) (\w+\.?\w*)")
+DIR_INFO_REGEX = re.compile(r"dir (\w+)")
+
 
 # Node class for filesystem tree
 class FilesystemNode(anytree.Node):
@@ -42,7 +45,7 @@ def print_tree(root: FilesystemNode):
 # Classes for representing input
 class FileInfo:
     def __init__(self, output: str) -> None:
-        m = re.match("(\d+) (\w+\.?\w*)", output)
+        m = FILE_INFO_REGEX.match(output)
         if m is None:
             raise ValueError("Command mismatch")
         self.size = int(m.group(1))
@@ -60,7 +63,7 @@ class FileInfo:
 
 class DirInfo:
     def __init__(self, output: str) -> None:
-        m = re.match("dir (\w+)", output)
+        m = DIR_INFO_REGEX.match(output)
         if m is None:
             raise ValueError("Command mismatch")
         self.name = m.group(1)
@@ -195,7 +198,7 @@ def solve_part_2(input_file: str) -> int:
 
 if __name__ == "__main__":
     print("Part I")
-    print(solve_part_1("input/day7.txt"))
+    print(solve_part_1("input/day07.txt"))
 
     print("Part II")
-    print(solve_part_2("input/day7.txt"))
+    print(solve_part_2("input/day07.txt"))
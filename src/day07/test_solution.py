@@ -10,3 +10,7 @@ class TestSolution(utils.test.TestSolutionTemplate):
 
         cls.part_1_result = 1232307
         cls.part_2_result = 7268994
+
+        # Solver time budgets (s)
+        cls.part_1_time_budget = 10.0
+        cls.part_2_time_budget = 10.0
@@ -100,12 +100,12 @@ def max_scenic_score(forest):
 
 
 def solve_part_1(input_file: str) -> int:
-    forest = utils.io.read_file_as_array(input_file, int)
+    forest = utils.io.read_file_as_grid(input_file, digits=True)
     return count_trees_visible_from_outside(forest)
 
 
 def solve_part_2(input_file: str) -> int:
-    forest = utils.io.read_file_as_array(input_file, int)
+    forest = utils.io.read_file_as_grid(input_file, digits=True)
     return max_scenic_score(forest)
 
 
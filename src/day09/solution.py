@@ -90,9 +90,14 @@ class RopeTracker:
 
 # Functions for solving
 def parse_input(path: str) -> List[Move]:
-    moves = utils.io.read_file_lines(path)
-
-    return [Move(direction=Direction(move[0]), distance=int(move[2:])) for move in moves]
+    moves = utils.io.read_file_as_columns(
+        path, r"^(?P<direction>[UDLR]) (?P<distance>\d+)$", dtypes={"direction": str}, as_dict=True
+    )
+
+    return [
+        Move(direction=Direction(direction), distance=distance)
+        for direction, distance in zip(moves["direction"].tolist(), moves["distance"].tolist())
+    ]
 
 
 def count_visited_by_tail(rope: RopeTracker, moves: List[Move]) -> int:
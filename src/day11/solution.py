@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import functools
 from collections import deque
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Sequence, Type
-
-import sympy
+from typing import List, Sequence, Tuple, Type
 
 import utils
+import utils.lazy
+
+sympy = utils.lazy.lazy_import("sympy")
 
 
 ###################################################
@@ -18,7 +20,9 @@ def get_prime_factors(x, limit):
 
 
 # From https://stackoverflow.com/a/39106237
-def find_primes_up_to(n):
+# Same for all items and inputs of a process (e.g. a batch worker, see utils.batch), so only computed once
+@functools.lru_cache(maxsize=None)
+def find_primes_up_to(n) -> Tuple[int, ...]:
     out = list()
     sieve = [True] * (n + 1)
     for p in range(2, n + 1):
@@ -26,7 +30,7 @@ def find_primes_up_to(n):
             out.append(p)
             for i in range(p, n + 1, p):
                 sieve[i] = False
-    return out
+    return tuple(out)
 
 
 ###################################################
@@ -307,16 +311,25 @@ def setup_game(input_file: str) -> MonkeyGame:
 ###################################################
 # Solvers
 ###################################################
-def solve_part_1(input_file: str) -> int:
-    game = setup_game(input_file)
+# Games reset monkeys before playing, so the parsed game is shared by both parts
+def part_1(session: utils.Session) -> int:
+    game = session.get("game", setup_game, session.input_file)
     return game.play(n_rounds=20, when_bored=WhenBoredCallback(relief_factor=3))
 
 
-def solve_part_2(input_file: str) -> int:
-    game = setup_game(input_file)
+def part_2(session: utils.Session) -> int:
+    game = session.get("game", setup_game, session.input_file)
     return game.play(n_rounds=10000, when_bored=WhenBoredCallback(relief_factor=1))
 
 
+def solve_part_1(input_file: str) -> int:
+    return part_1(utils.Session(11, input_file))
+
+
+def solve_part_2(input_file: str) -> int:
+    return part_2(utils.Session(11, input_file))
+
+
 if __name__ == "__main__":
     print("Part I")
     print(solve_part_1("input/day11.txt"))
@@ -10,3 +10,6 @@ class TestSolution(utils.test.TestSolutionTemplate):
 
         cls.part_1_result = 117640
         cls.part_2_result = 30616425600
+
+        # Solver time budgets (s)
+        cls.part_2_time_budget = 45.0
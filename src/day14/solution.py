@@ -8,7 +8,8 @@ from typing import List, Tuple
 import numpy as np
 
 import utils
-from utils.map import MapExtent, MapLine, MapPosition, MapStructure
+import utils.map
+from utils.map import Grid, MapExtent, MapLine, MapPosition, MapStructure
 
 
 @dataclass
@@ -23,10 +24,14 @@ class FillingCaveMap:
         FALLING_INTO_ABYSS = 2
         BLOCKED = 4
 
+    # Offsets (x, y) of moves of falling sand, by order of preference
+    SAND_MOVES = ((0, 1), (-1, 1), (1, 1))
+
     def __post_init__(self) -> None:
         # Determine size of map in memory
-        # Consider normal structures
-        self.extent: MapExtent = sum([s.extent() for s in self.structures], MapExtent())
+        # Consider normal structures, all walls being drawn at once
+        segments = utils.map.segments_array(self.structures)
+        self.extent: MapExtent = utils.map.segments_extent(segments)
 
         # Make sure we include the source
         self.extent += self.sand_source_pos.extent()
@@ -41,6 +46,7 @@ class FillingCaveMap:
             floor_end = MapPosition(x=self.sand_source_pos.x + delta_y, y=floor_depth)
             floor = MapLine([floor_start, floor_end])
             self.structures.append(MapStructure([floor]))
+            segments = np.concatenate((segments, utils.map.segments_array(self.structures[-1:])))
 
             self.extent += floor
 
@@ -50,10 +56,7 @@ class FillingCaveMap:
         self.__map_extent = MapExtent.from_shape(self.__map.shape)
         self.__map[self.__map_sand_source.s_] = "+"
 
-        for s in self.structures:
-            for line in s.lines:
-                map_wall = line - self.extent.top_left
-                self.__map[map_wall.s_] = "#"
+        utils.map.rasterize_segments(segments, self.__map, "#", origin=self.extent.top_left)
 
     def fill_with_sand(self) -> int:
         n_sand_units = 0
@@ -67,6 +70,22 @@ class FillingCaveMap:
                 break
         return n_sand_units
 
+    def fill_until_source_blocked(self) -> int:
+        """Faster fill_with_sand for caves with a floor: sand then settles on every cell it can fall to from the
+        source, so these are all found at once by a search along falling moves
+        """
+        if self.floor_depth_below_scan is None:
+            raise ValueError("Sand only blocks the source if the cave has a floor")
+
+        grid = Grid(
+            self.__map,
+            connectivity=self.SAND_MOVES,
+            can_move=lambda __, neighbor_values: neighbor_values != "#",
+        )
+        filled = grid.bfs(self.__map_sand_source) >= 0
+        self.__map[filled] = "O"
+        return int(filled.sum())
+
     def __generate_sand(self) -> SandState:
         pos = self.__map_sand_source
         sand_state = self.SandState.FALLING_DOWN
@@ -146,7 +165,7 @@ def solve_part_1(input_file: str):
 def solve_part_2(input_file: str):
     map_structures = setup_map_structures(input_file)
     cave_map = FillingCaveMap(map_structures, floor_depth_below_scan=2)
-    n_units = cave_map.fill_with_sand()
+    n_units = cave_map.fill_until_source_blocked()
 
     # Visualization
     os.makedirs("output", exist_ok=True)
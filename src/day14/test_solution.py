@@ -10,3 +10,10 @@ class TestSolution(utils.test.TestSolutionTemplate):
 
         cls.part_1_result = 745
         cls.part_2_result = 27551
+
+        # Imports numpy
+        cls.eager_imports = ("numpy",)
+        cls.import_time_budget = 0.4
+
+        # Solver time budgets (s)
+        cls.part_2_time_budget = 2.0
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-import multiprocessing
 from dataclasses import dataclass, field
-from typing import List
-
-import portion as P
+from typing import List, Tuple
 
 import utils
+import utils.intervals
+import utils.lazy
 from utils.map import ManhattanDistance, MapPosition
 
+np = utils.lazy.lazy_import("numpy")
+IntervalSet = utils.intervals.IntervalSet
+
 
 ####################################
 # Sensors
@@ -24,28 +26,43 @@ class SensorReading:
     def sensing_range(self) -> ManhattanDistance:
         return self.__beacon_dist
 
-    def row_coverage(self, row: int) -> P.Interval:
+    def row_coverage(self, row: int) -> IntervalSet:
         one_sided_extent = self.sensing_range().distance - abs(self.sensor.y - row)
-        return P.closed(self.sensor.x - one_sided_extent, self.sensor.x + one_sided_extent)
+        return IntervalSet.closed(
+            self.sensor.x - one_sided_extent, self.sensor.x + one_sided_extent
+        )
 
 
 @dataclass
 class SensorReadings:
     readings: List[SensorReading] = field(default_factory=list)
 
-    def row_coverage(self, row: int) -> P.Interval:
-        interval = P.empty()
-        for reading in self.readings:
-            interval |= reading.row_coverage(row)
-        return interval
+    def __post_init__(self):
+        # Sensor coordinates and ranges as arrays, to get the coverage of many rows at once
+        self.sensor_x = np.array([reading.sensor.x for reading in self.readings], dtype=np.int64)
+        self.sensor_y = np.array([reading.sensor.y for reading in self.readings], dtype=np.int64)
+        self.ranges = np.array(
+            [reading.sensing_range().distance for reading in self.readings], dtype=np.int64
+        )
+
+    def rows_coverage(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Interval covered by each sensor on each row, as (rows, sensors) start and end arrays (intervals of
+        sensors out of range of a row are empty, i.e. start after their end)
+        """
+        one_sided_extent = self.ranges - np.abs(self.sensor_y - rows[:, np.newaxis])
+        return self.sensor_x - one_sided_extent, self.sensor_x + one_sided_extent
+
+    def row_coverage(self, row: int) -> IntervalSet:
+        starts, ends = self.rows_coverage(np.array([row]))
+        return IntervalSet(starts[0], ends[0])
 
 
 ####################################
 # Parsing helpers
 ####################################
-number_regex = "[-\d]"
+number_regex = r"[-\d]"
 sensor_reading_regex = (
-    f"[\w ]+ x=({number_regex}+), y=({number_regex}+): [\w ]+ x=({number_regex}+),"
+    rf"[\w ]+ x=({number_regex}+), y=({number_regex}+): [\w ]+ x=({number_regex}+),"
     f" y=({number_regex}+)"
 )
 
@@ -74,14 +91,12 @@ def count_no_beacon_positions(sensor_readings: SensorReadings, row: int) -> int:
     no_beacon_interval = sensor_readings.row_coverage(row)
 
     # Remove beacons from row coverage
-    beacons_in_coverage = [
-        reading.beacon for reading in sensor_readings.readings if reading.beacon.y == row
+    beacons_x = [
+        reading.beacon.x for reading in sensor_readings.readings if reading.beacon.y == row
     ]
-    for beacon in beacons_in_coverage:
-        no_beacon_interval &= ~P.open(beacon.x - 1, beacon.x + 1)
+    no_beacon_interval -= IntervalSet(beacons_x, beacons_x)
 
-    # Sum length of each atomic subinterval
-    return sum([i.upper - i.lower + 1 for i in no_beacon_interval])
+    return no_beacon_interval.length()
 
 
 @utils.timing.timing
@@ -90,40 +105,29 @@ def solve_part_1(input_file: str, row: int = 2000000) -> int:
     return count_no_beacon_positions(sensor_readings, row)
 
 
-# Pool.map only works with pickleable functions. AFAIK, it only works with "top-level" functions, so
-# I used global parameters /variables. I don't care enough to make it cleaner for now.
-max_coord_val = 0
 frequency_multiplier = 4000000
-sensor_readings = None
-
-
-def check_row(row):
-    x_interval = P.closed(0, max_coord_val)
-    covered_interval = sensor_readings.row_coverage(row)
-    if x_interval not in covered_interval:
-        covered_interval = (covered_interval | ~x_interval) & x_interval
-
-        x = x_interval - covered_interval
-        x = x.upper - 1
-        return frequency_multiplier * x + row
-    else:
-        return None
+# Number of rows whose coverage is computed at once (memory is rows_per_block * sensors * 8 bytes per array)
+rows_per_block = 1 << 16
+
+
+def find_distress_beacon(sensor_readings: SensorReadings, grid_size: int) -> MapPosition:
+    """Only position of [0, grid_size]² not covered by any sensor, None if there is none"""
+    for first_row in range(0, grid_size + 1, rows_per_block):
+        rows = np.arange(first_row, min(first_row + rows_per_block, grid_size + 1), dtype=np.int64)
+        starts, ends = sensor_readings.rows_coverage(rows)
+        uncovered_x = utils.intervals.first_uncovered(starts, ends, 0, grid_size)
+        uncovered_rows = np.flatnonzero(uncovered_x <= grid_size)
+        if len(uncovered_rows):
+            ind = uncovered_rows[0]
+            return MapPosition(int(uncovered_x[ind]), int(rows[ind]))
+    return None
 
 
 @utils.timing.timing
 def solve_part_2(input_file: str, grid_size: int = 4000000) -> int:
-    global sensor_readings
-    global max_coord_val
-    max_coord_val = grid_size
     sensor_readings = setup_sensor_readings(input_file)
-
-    with multiprocessing.Pool(8) as pool:
-        for result in pool.map(check_row, range(max_coord_val + 1)):
-            if result is not None:
-                print(result)
-                return result
-
-    return None
+    beacon = find_distress_beacon(sensor_readings, grid_size)
+    return None if beacon is None else frequency_multiplier * beacon.x + beacon.y
 
 
 if __name__ == "__main__":
@@ -16,3 +16,6 @@ class TestSolution(utils.test.TestSolutionTemplate):
 
         cls.part_2_result = 11379394658764
         cls.part_2_kwargs = {"grid_size": 4000000}
+
+        # Solver time budgets (s)
+        cls.part_2_time_budget = 20.0
@@ -4,10 +4,11 @@ import itertools
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple
 
-import dijkstar
-import dijkstar.algorithm
-
 import utils
+import utils.lazy
+
+# dijkstar.algorithm is imported by the package
+dijkstar = utils.lazy.lazy_import("dijkstar")
 
 
 ####################################
@@ -37,7 +38,7 @@ ValveTupleTupleDict = Dict[Tuple[ValveTuple, ...], int]
 ####################################
 # Parsing helpers
 ####################################
-VALVE_REGEX = "Valve (\w{2}) [\w ]+=(\d+); [\w ]+ valves? ([\w, ]+)"
+VALVE_REGEX = r"Valve (\w{2}) [\w ]+=(\d+); [\w ]+ valves? ([\w, ]+)"
 
 
 def parse_data_as_valve(data: utils.io.InputData) -> Valve:
@@ -138,9 +139,10 @@ def explore_DFS(
         path_flows[valves_in_path] = current_flow
 
 
-@utils.timing.timing
-def solve_part_1(input_file: str) -> int:
-    path_start, remaining_valves, travel_times = initialize_problem(input_file)
+def part_1(session: utils.Session) -> int:
+    path_start, remaining_valves, travel_times = session.get(
+        "problem", initialize_problem, session.input_file
+    )
 
     path_flows = {}
     explore_DFS(
@@ -155,9 +157,10 @@ def solve_part_1(input_file: str) -> int:
     return max_flow
 
 
-@utils.timing.timing
-def solve_part_2(input_file: str) -> int:
-    path_start, remaining_valves, travel_times = initialize_problem(input_file)
+def part_2(session: utils.Session) -> int:
+    path_start, remaining_valves, travel_times = session.get(
+        "problem", initialize_problem, session.input_file
+    )
 
     path_flows = {}
     explore_DFS(
@@ -195,6 +198,16 @@ def solve_part_2(input_file: str) -> int:
     return max_pressure
 
 
+@utils.timing.timing
+def solve_part_1(input_file: str) -> int:
+    return part_1(utils.Session(16, input_file))
+
+
+@utils.timing.timing
+def solve_part_2(input_file: str) -> int:
+    return part_2(utils.Session(16, input_file))
+
+
 if __name__ == "__main__":
     print("Part I")
     print(solve_part_1("input/day16.txt"))
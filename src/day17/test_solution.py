@@ -10,3 +10,7 @@ class TestSolution(utils.test.TestSolutionTemplate):
 
         cls.part_1_result = 3085
         cls.part_2_result = None
+
+        # Imports numpy
+        cls.eager_imports = ("numpy",)
+        cls.import_time_budget = 0.4
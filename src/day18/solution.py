@@ -5,10 +5,13 @@ from enum import Enum
 from typing import List, Tuple
 
 import numpy as np
-import scipy.ndimage.measurements
-import skimage.segmentation
 
 import utils
+import utils.lazy
+import utils.map
+
+ndimage = utils.lazy.lazy_import("scipy.ndimage")
+segmentation = utils.lazy.lazy_import("skimage.segmentation")
 
 
 ######################################
@@ -89,42 +92,37 @@ class LavaDroplet:
     presence_marker = VoxelFace.Z_NEG.value << 1
 
     def __post_init__(self):
-        # Assume array is small and no negative coordinates
-        x_max = max([c.x for c in self.lava_cubes])
-        y_max = max([c.y for c in self.lava_cubes])
-        z_max = max([c.z for c in self.lava_cubes])
-
-        # Each bit of the integer means a surface is an outer surface
-        self.__array = np.zeros((x_max + 1, y_max + 1, z_max + 1), dtype=np.uint8)
+        # Each bit of the integer means a surface is an outer surface. Tiles are only allocated around cubes, and
+        # coordinates can be negative
+        self.__array = utils.map.TileMap(tile_shape=(16, 16, 16), dtype=np.uint8)
 
         for cube in self.lava_cubes:
             self.__set_faces_for_cube(cube)
 
     def __set_faces_for_cube(self, cube):
-        self.__array[cube.s_] = VoxelFace.ALL.value + self.presence_marker
+        cube_value = VoxelFace.ALL.value + self.presence_marker
         for face in VoxelFace.all_single_faces():
             neighbor = cube + face
+            neighbor_value = int(self.__array[neighbor.s_])
             # If neighbour present, deactivate touching faces
-            if self.__is_in_array(neighbor) and self.__array[neighbor.s_] > 0:
-                self.__array[cube.s_] &= ~face.value
-                self.__array[neighbor.s_] &= ~face.inverse().value
-
-    def contains_lava_array(self) -> np.ndarray:
-        return np.greater(self.__array, 0)
-
-    def __is_in_array(self, cube: Voxel):
-        x_size, y_size, z_size = self.__array.shape
-        return (
-            cube.x >= 0
-            and cube.x < x_size
-            and cube.y >= 0
-            and cube.y < y_size
-            and cube.z >= 0
-            and cube.z < z_size
-        )
+            if neighbor_value > 0:
+                cube_value &= ~face.value
+                self.__array[neighbor.s_] = neighbor_value & ~face.inverse().value
+        self.__array[cube.s_] = cube_value
+
+    def contains_lava_array(self) -> Tuple[np.ndarray, Tuple[int, int, int]]:
+        """Whether voxels of the region covered by the droplet contain lava, and coordinates of the region's first
+        voxel
+        """
+        array, origin = self.__array.to_dense()
+        return np.greater(array, 0), origin
 
     def total_surface_area(self) -> int:
-        return np.unpackbits(np.bitwise_and(self.__array, VoxelFace.ALL.value)).sum()
+        # Voxels outside of allocated tiles have no surface
+        return sum(
+            int(np.unpackbits(np.bitwise_and(tile, VoxelFace.ALL.value)).sum())
+            for tile in self.__array.tiles.values()
+        )
 
 
 ######################################
@@ -155,7 +153,7 @@ def solve_part_1(input_file: str):
 # Equivalent to skimage.segmentation.clear_border with 6 (instead of 14 ) connectivity
 # From https://stackoverflow.com/questions/70193514/change-connection-definitions-for-clear-border-in-python
 def clear_border_adjacent(matrix):
-    border_cleared = skimage.segmentation.clear_border(scipy.ndimage.label(matrix)[0])
+    border_cleared = segmentation.clear_border(ndimage.label(matrix)[0])
     border_cleared[border_cleared > 0] = 1
     return border_cleared
 
@@ -163,12 +161,14 @@ def clear_border_adjacent(matrix):
 @utils.timing.timing
 def solve_part_2(input_file: str):
     droplet = setup_droplet(input_file)
-    non_filled = np.logical_not(droplet.contains_lava_array())
+    contains_lava, (x_origin, y_origin, z_origin) = droplet.contains_lava_array()
+    non_filled = np.logical_not(contains_lava)
     to_fill = clear_border_adjacent(non_filled)
 
     lava_cubes = list(droplet.lava_cubes)
 
     x_coords, y_coords, z_coords = np.nonzero(to_fill)
+    x_coords, y_coords, z_coords = x_coords + x_origin, y_coords + y_origin, z_coords + z_origin
     lava_cubes.extend([Voxel(x, y, z) for x, y, z in zip(x_coords, y_coords, z_coords)])
 
     filled_droplet = LavaDroplet(lava_cubes)
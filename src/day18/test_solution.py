@@ -10,3 +10,7 @@ class TestSolution(utils.test.TestSolutionTemplate):
 
         cls.part_1_result = 3390
         cls.part_2_result = 2058
+
+        # Imports numpy
+        cls.eager_imports = ("numpy",)
+        cls.import_time_budget = 0.4
@@ -10,3 +10,6 @@ class TestSolution(utils.test.TestSolutionTemplate):
 
         cls.part_1_result = 13967
         cls.part_2_result = 1790365671518
+
+        # Solver time budgets (s)
+        cls.part_2_time_budget = 40.0
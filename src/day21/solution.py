@@ -177,9 +177,12 @@ class Human(YellingMonkey):
 ######################################
 # Parsing utils
 ######################################
+MATH_MONKEY_REGEX = re.compile(r"(\w{4}) ([+\-*/]) (\w{4})")
+
+
 def parse_data_as_monkey(data: utils.io.InputData) -> YellingMonkey:
     name = data[0]
-    m = re.match("(\w{4}) ([+\-*/]) (\w{4})", data[1])
+    m = MATH_MONKEY_REGEX.match(data[1])
     if m is not None:
         return MathYellingMonkey(
             name=name,
@@ -191,11 +194,15 @@ def parse_data_as_monkey(data: utils.io.InputData) -> YellingMonkey:
         return YellingMonkey(name=name, number=int(data[1]))
 
 
-def setup_monkeys(input_file: str) -> List[YellingMonkey]:
-    parser = utils.io.FileParser(data_parser=parse_data_as_monkey, line_sep=": ")
+def read_monkey_data(input_file: str) -> utils.io.InputDataList:
+    parser = utils.io.FileParser(data_parser=tuple, line_sep=": ")
     return parser.parse_file(input_file)
 
 
+def setup_monkeys(monkey_data: utils.io.InputDataList) -> List[YellingMonkey]:
+    return [parse_data_as_monkey(data) for data in monkey_data]
+
+
 ######################################
 # Solvers
 ######################################
@@ -216,16 +223,15 @@ def shout_it_all_out(monkeys: List[YellingMonkey], reverse_order=False) -> Yelli
     return root_monkey
 
 
-@utils.timing.timing
-def solve_part_1(input_file: str) -> int:
-    monkeys = setup_monkeys(input_file)
+# Monkeys are modified when solving, so each part sets up its own from the shared input data
+def part_1(session: utils.Session) -> int:
+    monkeys = setup_monkeys(session.get("monkey data", read_monkey_data, session.input_file))
     root_monkey = shout_it_all_out(monkeys)
     return root_monkey.shout().value
 
 
-@utils.timing.timing
-def solve_part_2(input_file: str) -> int:
-    monkeys = setup_monkeys(input_file)
+def part_2(session: utils.Session) -> int:
+    monkeys = setup_monkeys(session.get("monkey data", read_monkey_data, session.input_file))
     # Modify root monkey rules
     root_ind = [ind for ind, monkey in enumerate(monkeys) if monkey.name() == "root"][0]
     monkeys[root_ind] = RootMonkey(
@@ -251,6 +257,16 @@ def solve_part_2(input_file: str) -> int:
     return human.shout().value
 
 
+@utils.timing.timing
+def solve_part_1(input_file: str) -> int:
+    return part_1(utils.Session(21, input_file))
+
+
+@utils.timing.timing
+def solve_part_2(input_file: str) -> int:
+    return part_2(utils.Session(21, input_file))
+
+
 if __name__ == "__main__":
     print("Part I")
     print(solve_part_1("input/day21.txt"))
@@ -1,5 +1,33 @@
-import utils.conversions as conversions
-import utils.io as io
-import utils.map as map
-import utils.test as test
-import utils.timing as timing
+import importlib
+
+# Submodules are imported on first access (e.g. utils.io), so that using one of them does not import all the
+# others and their dependencies (e.g. pytest for utils.test)
+__all__ = [
+    "batch",
+    "benchmark",
+    "cache",
+    "conversions",
+    "env",
+    "generators",
+    "importtime",
+    "intervals",
+    "io",
+    "lazy",
+    "map",
+    "profiling",
+    "results",
+    "run",
+    "scaling",
+    "server",
+    "session",
+    "test",
+    "timing",
+]
+
+
+def __getattr__(name: str):
+    if name == "Session":
+        return importlib.import_module("utils.session").Session
+    if name in __all__:
+        return importlib.import_module(f"utils.{name}")
+    raise AttributeError(f"module 'utils' has no attribute '{name}'")
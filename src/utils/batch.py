@@ -0,0 +1,139 @@
+"""Solve a part of a day on many input files, with a pool of worker processes.
+
+Run from the repository root, e.g.
+    PYTHONPATH=src python -m utils.batch 25 1 inputs/day25/*.txt --workers 4
+
+Workers import the solution (and its lazily imported dependencies) once, then solve chunks of inputs, so that
+input-independent precomputation (module-level tables, or values cached by the solution, e.g. day11's primes) is
+shared by all inputs of a worker. Results are streamed as chunks complete.
+"""
+
+import argparse
+import concurrent.futures
+import importlib
+import os
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import utils.lazy
+import utils.run
+import utils.session
+
+# Default number of chunks per worker, so that workers finishing early get more work
+CHUNKS_PER_WORKER = 4
+MAX_CHUNK_SIZE = 64
+
+
+@dataclass
+class BatchResult:
+    # Index of input in the requested paths
+    index: int
+    input_file: str
+    answer: Any = None
+    # Solver duration in seconds
+    time: float = None
+    error: str = None
+
+
+def _init_worker(day: int) -> None:
+    # Some solvers print a lot (e.g. day07 prints its tree), which is not part of their answer
+    sys.stdout = open(os.devnull, "w")
+    utils.lazy.preload(importlib.import_module(f"{utils.run.day_string(day)}.solution"))
+
+
+def _solve_chunk(
+    day: int, part: int, chunk: Sequence[Tuple[int, str]], solver_kwargs: Dict
+) -> List[BatchResult]:
+    results = []
+    for index, input_file in chunk:
+        start = time.perf_counter()
+        try:
+            answer = utils.session.Session(day, input_file).solve(part, **solver_kwargs)
+            results.append(BatchResult(index, input_file, answer, time.perf_counter() - start))
+        except Exception:
+            results.append(BatchResult(index, input_file, error=traceback.format_exc()))
+    return results
+
+
+def default_chunk_size(n_inputs: int, workers: int) -> int:
+    chunk_size = -(-n_inputs // (workers * CHUNKS_PER_WORKER))
+    return max(1, min(chunk_size, MAX_CHUNK_SIZE))
+
+
+def solve_many(
+    day: int,
+    part: int,
+    paths: Sequence[str],
+    workers: int = 1,
+    chunk_size: int = None,
+    solver_kwargs: Dict = None,
+) -> Iterator[BatchResult]:
+    """Solve part of day on each input file, yielding results as they are ready (i.e. not in the order of paths)
+
+    Args:
+        day (int): Day
+        part (int): Part
+        paths (Sequence[str]): Input files
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        chunk_size (int, optional): Number of inputs sent to a worker at once. Defaults to None (a few chunks per
+            worker, at most MAX_CHUNK_SIZE inputs each).
+        solver_kwargs (Dict, optional): Solver arguments, same for all inputs. Defaults to None (none).
+
+    Yields:
+        Iterator[BatchResult]: Answer (or error) of each input
+    """
+    indexed_paths = list(enumerate(paths))
+    chunk_size = chunk_size or default_chunk_size(len(indexed_paths), workers)
+    chunks = [
+        indexed_paths[start : start + chunk_size]
+        for start in range(0, len(indexed_paths), chunk_size)
+    ]
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(day,)
+    ) as executor:
+        futures = [
+            executor.submit(_solve_chunk, day, part, chunk, solver_kwargs or {}) for chunk in chunks
+        ]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                yield from future.result()
+        finally:
+            # Iteration stopped early
+            for future in futures:
+                future.cancel()
+
+
+def main(args: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Solve a part of a day on many input files")
+    parser.add_argument("day", type=int)
+    parser.add_argument("part", type=int)
+    parser.add_argument("paths", nargs="+", help="Input files")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--chunk-size", type=int, help="Inputs sent to a worker at once")
+    options = parser.parse_args(args)
+
+    start = time.perf_counter()
+    n_errors = 0
+    for result in solve_many(
+        options.day,
+        options.part,
+        options.paths,
+        workers=options.workers,
+        chunk_size=options.chunk_size,
+    ):
+        if result.error:
+            n_errors += 1
+            print(f"{result.input_file}: error\n{result.error}")
+        else:
+            print(f"{result.input_file}: {result.answer} ({result.time:.4f} s)")
+    wall_time = time.perf_counter() - start
+    print(f"{len(options.paths)} inputs in {wall_time:.2f} s with {options.workers} worker(s)")
+    return int(n_errors > 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
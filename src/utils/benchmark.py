@@ -0,0 +1,172 @@
+"""Benchmark tests of solvers, compared to a baseline of median times.
+
+Baselines depend on the machine, so none is committed: store one, then compare later runs to it, from the
+repository root:
+    AOC_BENCHMARK=update python -m pytest src -k benchmark   # Writes benchmark_baseline.json
+    AOC_BENCHMARK=1 python -m pytest src -k benchmark        # Fails on regressions and on solvers without baseline
+On-disk caches (e.g. parsed inputs) are disabled while benchmarking, so that warm-up runs do not turn timed runs into
+cache hits.
+Results of the last run are written to output/benchmark.json.
+"""
+
+import json
+import math
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List
+
+import pytest
+
+import utils.cache
+
+# "1" runs benchmarks and compares them to the baseline, "update" runs them and stores them as new baseline.
+# Benchmarks are skipped otherwise
+BENCHMARK_ENV = "AOC_BENCHMARK"
+# Baseline file, committed to the repository
+BASELINE_ENV = "AOC_BENCHMARK_BASELINE"
+DEFAULT_BASELINE = "benchmark_baseline.json"
+# Benchmark fails if its median time is more than this ratio times the baseline median
+MAX_RATIO_ENV = "AOC_BENCHMARK_MAX_RATIO"
+DEFAULT_MAX_RATIO = 1.5
+# Regressions smaller than this (in seconds) are considered noise, whatever the ratio
+MIN_REGRESSION = 1e-3
+# Overrides number of timed runs of all benchmarks
+REPEATS_ENV = "AOC_BENCHMARK_REPEATS"
+# Results of last run
+RESULTS_PATH = os.path.join("output", "benchmark.json")
+
+
+@dataclass
+class BenchmarkResult:
+    # Duration of each timed run, in seconds
+    times: List[float] = field(default_factory=list)
+
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    def p95(self) -> float:
+        # Nearest-rank percentile
+        sorted_times = sorted(self.times)
+        return sorted_times[math.ceil(0.95 * len(sorted_times)) - 1]
+
+    def to_dict(self) -> Dict:
+        return {"median": self.median(), "p95": self.p95(), "repeats": len(self.times)}
+
+
+def run_benchmark(
+    solver: Callable, input_file: str, solver_kwargs: Dict, repeats: int, warmup: int
+) -> BenchmarkResult:
+    """Time solver on input file
+
+    Args:
+        solver (Callable): Solver
+        input_file (str): Input file path
+        solver_kwargs (Dict): Extra solver arguments
+        repeats (int): Number of timed runs
+        warmup (int): Number of untimed runs done first
+
+    Returns:
+        BenchmarkResult: Timed runs
+    """
+    for __ in range(warmup):
+        solver(input_file, **solver_kwargs)
+
+    result = BenchmarkResult()
+    for __ in range(repeats):
+        start = time.perf_counter()
+        solver(input_file, **solver_kwargs)
+        result.times.append(time.perf_counter() - start)
+    return result
+
+
+@contextmanager
+def caches_disabled() -> Iterator[None]:
+    """Disable on-disk caches (see utils.cache.NO_CACHE_ENV) within context"""
+    previous = os.environ.get(utils.cache.NO_CACHE_ENV)
+    os.environ[utils.cache.NO_CACHE_ENV] = "1"
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ[utils.cache.NO_CACHE_ENV]
+        else:
+            os.environ[utils.cache.NO_CACHE_ENV] = previous
+
+
+def load_json(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def update_json(path: str, key: str, value: Dict) -> None:
+    data = load_json(path)
+    data[key] = value
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+class BenchmarkSolutionTemplate:
+    """Benchmark tests for the solvers configured by TestSolutionTemplate (see its _solver_test_config).
+    Only run when enabled (see BENCHMARK_ENV).
+    """
+
+    benchmark_repeats: int = 5
+    benchmark_warmup: int = 1
+
+    def _run_benchmark(self, name: str) -> None:
+        """Benchmark solver of solver test name (e.g. "part_1_example")"""
+        # Checked first, so that disabled benchmarks do not set up the solution
+        mode = os.environ.get(BENCHMARK_ENV, "0")
+        if mode in ("", "0"):
+            pytest.skip("Benchmarks not enabled")
+
+        solver, input_file, solver_kwargs, result = self._solver_test_config(name)
+        if solver is None or not os.path.exists(input_file) or result is None:
+            pytest.skip("Test not configured")
+
+        repeats = int(os.environ.get(REPEATS_ENV, self.benchmark_repeats))
+        with caches_disabled():
+            benchmark = run_benchmark(
+                solver, input_file, solver_kwargs, repeats=repeats, warmup=self.benchmark_warmup
+            )
+
+        key = f"{self.day_string}.{name}"
+        update_json(RESULTS_PATH, key, benchmark.to_dict())
+
+        baseline_path = os.environ.get(BASELINE_ENV, DEFAULT_BASELINE)
+        if mode == "update":
+            update_json(baseline_path, key, benchmark.to_dict())
+            return
+
+        baseline = load_json(baseline_path).get(key)
+        if baseline is None:
+            pytest.fail(
+                f"No baseline for {key} in {baseline_path} (store one with {BENCHMARK_ENV}=update)"
+            )
+
+        max_ratio = float(os.environ.get(MAX_RATIO_ENV, DEFAULT_MAX_RATIO))
+        ratio = benchmark.median() / baseline["median"]
+        is_noise = benchmark.median() - baseline["median"] < MIN_REGRESSION
+        assert is_noise or ratio <= max_ratio, (
+            f"{key} regressed: median {benchmark.median():.4f}s vs baseline"
+            f" {baseline['median']:.4f}s (x{ratio:.2f} > x{max_ratio})"
+        )
+
+    def test_part_1_example_benchmark(self):
+        self._run_benchmark("part_1_example")
+
+    def test_part_1_benchmark(self):
+        self._run_benchmark("part_1")
+
+    def test_part_2_example_benchmark(self):
+        self._run_benchmark("part_2_example")
+
+    def test_part_2_benchmark(self):
+        self._run_benchmark("part_2")
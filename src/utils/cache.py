@@ -0,0 +1,270 @@
+import glob
+import hashlib
+import importlib
+import os
+import pickle
+import sys
+import types
+from typing import Any, Callable, Dict, Tuple
+
+import utils.env
+import utils.lazy
+
+np = utils.lazy.lazy_import("numpy")
+
+# Default location of on-disk caches (relative to working directory, i.e. repo root for tests)
+CACHE_DIR_ENV = "AOC_CACHE_DIR"
+DEFAULT_CACHE_DIR = ".cache"
+
+# Setting this environment variable to anything but "" or "0" bypasses all caches
+NO_CACHE_ENV = "AOC_NO_CACHE"
+
+# Hashes of already hashed files, keyed by (path, size, modification time)
+_file_hashes: Dict[Tuple[str, int, int], str] = {}
+
+
+def cache_disabled() -> bool:
+    return utils.env.flag(NO_CACHE_ENV)
+
+
+def hash_bytes(*items: Any) -> str:
+    """Stable hash of items, using their repr
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.blake2b(repr(items).encode(), digest_size=16).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """Hash of file content. Hash is remembered for the duration of the process, as long as the
+    file is not modified.
+
+    Args:
+        path (str): file path
+
+    Returns:
+        str: Hex digest
+    """
+    stat = os.stat(path)
+    stat_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if stat_key not in _file_hashes:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _file_hashes[stat_key] = h.hexdigest()
+    return _file_hashes[stat_key]
+
+
+def _hash_code(code: types.CodeType) -> str:
+    """Hash of a code object: bytecode, constants (including nested code objects, e.g. of lambdas) and names"""
+    consts = tuple(
+        _hash_code(const) if isinstance(const, types.CodeType) else const
+        for const in code.co_consts
+    )
+    return hash_bytes(code.co_code, consts, code.co_names)
+
+
+def hash_callable(func: Callable) -> str:
+    """Identify a function by its qualified name and by the source of the module defining it, so
+    that editing the module invalidates cached results. Its code, default arguments and closure values are also
+    hashed, since lambdas and closures of a module share their qualified names (e.g. "<lambda>").
+
+    Args:
+        func (Callable): Function (or type) to identify
+
+    Returns:
+        str: Hex digest
+    """
+    module_name = getattr(func, "__module__", None)
+    qualified_name = getattr(func, "__qualname__", repr(func))
+    module_file = getattr(sys.modules.get(module_name), "__file__", None)
+    module_hash = hash_file(module_file) if module_file and os.path.exists(module_file) else None
+    code = getattr(func, "__code__", None)
+    # Closure values are identified by their repr
+    closure = tuple(cell.cell_contents for cell in getattr(func, "__closure__", None) or ())
+    return hash_bytes(
+        module_name,
+        qualified_name,
+        module_hash,
+        _hash_code(code) if code is not None else None,
+        getattr(func, "__defaults__", None),
+        closure,
+    )
+
+
+def hash_package(package: str) -> str:
+    """Hash of the sources of a package's modules (e.g. "utils"), so that editing classes of cached objects defined
+    in the package (e.g. utils.map.MapPosition) invalidates cached results.
+
+    Args:
+        package (str): Package name
+
+    Returns:
+        str: Hex digest
+    """
+    directory = importlib.import_module(package).__path__[0]
+    paths = sorted(glob.glob(os.path.join(directory, "*.py")))
+    return hash_bytes(*[(os.path.basename(path), hash_file(path)) for path in paths])
+
+
+def _remove(path: str) -> None:
+    """Remove file, if not already removed (e.g. by another process using the same cache)"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class DiskCache:
+    """Size-bounded key/value store on disk. numpy arrays are saved as .npy files, other objects are
+    pickled. When the total size exceeds max_size_bytes, least recently used entries are removed.
+    Several processes may use the same cache concurrently.
+    """
+
+    EVICT_SCAN_INTERVAL = 64
+
+    def __init__(
+        self,
+        name: str,
+        max_size_bytes: int = 512 * 2**20,
+        directory: str = None,
+        enabled: bool = True,
+    ) -> None:
+        """
+        Args:
+            name (str): Name of the cache, used as sub-directory
+            max_size_bytes (int, optional): Maximum total size of the cache files. Defaults to 512 MB.
+            directory (str, optional): Root directory of caches. Defaults to None ($AOC_CACHE_DIR or .cache).
+            enabled (bool, optional): When False, get always misses and put does nothing. Defaults to True.
+        """
+        root = directory or os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+        self.directory = os.path.join(root, name)
+        self.max_size_bytes = max_size_bytes
+        self.enabled = enabled
+        # Approximate total size of entries (None until first measured), increased by each put so that the
+        # directory is only scanned when it may be over budget. Other processes may write to the same directory,
+        # so it is also measured again every EVICT_SCAN_INTERVAL puts.
+        self._size: int = None
+        self._puts_since_scan = 0
+
+    def is_enabled(self) -> bool:
+        return self.enabled and not cache_disabled()
+
+    def __entry_paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return base + ".npy", base + ".pkl"
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Look up entry
+
+        Args:
+            key (str): Entry key
+
+        Returns:
+            Tuple[bool, Any]: Whether the entry was found, and its value (None if not found)
+        """
+        if not self.is_enabled():
+            return False, None
+
+        for entry_path in self.__entry_paths(key):
+            if not os.path.exists(entry_path):
+                continue
+            try:
+                if entry_path.endswith(".npy"):
+                    value = np.load(entry_path, allow_pickle=False)
+                else:
+                    with open(entry_path, "rb") as f:
+                        value = pickle.load(f)
+                # Mark as recently used
+                os.utime(entry_path)
+            except FileNotFoundError:
+                # Evicted by another process
+                return False, None
+            except Exception:
+                # Corrupted or no longer loadable (e.g. class was renamed): drop it
+                _remove(entry_path)
+                return False, None
+            return True, value
+        return False, None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store entry, then evict least recently used entries if cache is too large
+
+        Args:
+            key (str): Entry key
+            value (Any): Array or picklable object
+        """
+        if not self.is_enabled():
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        npy_path, pkl_path = self.__entry_paths(key)
+        # Value can only be an array if numpy was imported, so other values do not import it
+        is_plain_array = (
+            "numpy" in sys.modules and isinstance(value, np.ndarray) and not value.dtype.hasobject
+        )
+        entry_path = npy_path if is_plain_array else pkl_path
+
+        # Write to temporary file first, so that concurrent readers never see partial entries
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                if is_plain_array:
+                    np.save(f, value, allow_pickle=False)
+                else:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            # Value cannot be cached
+            _remove(tmp_path)
+            return
+        entry_size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, entry_path)
+
+        self._puts_since_scan += 1
+        if self._size is None or self._puts_since_scan >= self.EVICT_SCAN_INTERVAL:
+            self.evict()
+        else:
+            self._size += entry_size
+            if self._size > self.max_size_bytes:
+                self.evict()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        found, value = self.get(key)
+        if not found:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def evict(self) -> None:
+        """Remove least recently used entries until cache fits in max_size_bytes, and measure its size"""
+        if not os.path.isdir(self.directory):
+            return
+
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            _remove(entry_path)
+            total_size -= size
+
+        self._size = total_size
+        self._puts_since_scan = 0
+
+    def clear(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                _remove(entry.path)
+        self._size = 0
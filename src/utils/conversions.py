@@ -1,22 +1,91 @@
-import numpy as np
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Mapping
+
+import utils.lazy
+
+np = utils.lazy.lazy_import("numpy")
+
+# Value of chars without a code in a lookup table
+INVALID_CODE = 255
+
+
+def lookup_table(codes: Mapping[str, int]) -> np.ndarray:
+    """Table mapping each byte value to a code (e.g. {"a": 0, "b": 1}), INVALID_CODE for chars not in codes
+
+    Returns:
+        np.ndarray: 256 uint8 array, to be indexed by char codes
+    """
+    table = np.full(256, INVALID_CODE, dtype=np.uint8)
+    for char, code in codes.items():
+        if not 0 <= code < INVALID_CODE:
+            raise ValueError(f"Code of {char!r} must be in [0, {INVALID_CODE})")
+        table[ord(char)] = code
+    return table
+
+
+@lru_cache(maxsize=None)
+def alpha_table(min_value: int = 0) -> np.ndarray:
+    """Lookup table of a-z --> min_value...min_value + 25 and A-Z --> min_value + 26...min_value + 51"""
+    letters = [chr(c) for c in range(ord("a"), ord("z") + 1)]
+    letters += [chr(c) for c in range(ord("A"), ord("Z") + 1)]
+    table = lookup_table({char: min_value + ind for ind, char in enumerate(letters)})
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=None)
+def digit_table() -> np.ndarray:
+    """Lookup table of 0-9 --> 0...9"""
+    table = lookup_table({str(digit): digit for digit in range(10)})
+    table.flags.writeable = False
+    return table
+
+
+def priority_table() -> np.ndarray:
+    """Lookup table of a-z --> 1...26 and A-Z --> 27...52"""
+    return alpha_table(min_value=1)
+
+
+def decode_bytes(codes: np.ndarray, table: np.ndarray, dtype=None) -> np.ndarray:
+    """Map char codes (e.g. raw file bytes) to their value in a lookup table, in one pass
+
+    Args:
+        codes (np.ndarray): uint8 array of char codes, of any shape
+        table (np.ndarray): Lookup table (see lookup_table)
+        dtype (optional): Data type of result. Defaults to None (table's, i.e. uint8).
+
+    Raises:
+        ValueError: If a char is not in table
+
+    Returns:
+        np.ndarray: Values, of same shape as codes
+    """
+    if codes.dtype != np.uint8:
+        raise ValueError("Input must be uint8 char codes")
+    values = np.take(table, codes)
+    if np.any(values == INVALID_CODE):
+        raise ValueError("Array contains chars not in lookup table")
+    return values if dtype is None else values.astype(dtype, copy=False)
 
 
 def get_char_value_str(c: str, min_value: int = 0) -> str:
-    if c.islower():
-        return str(ord(c) - ord("a") + min_value)
-    else:
-        return str(ord(c) - ord("A") + min_value + 26)
+    code = ord(c)
+    value = alpha_table(min_value)[code] if code < 256 else INVALID_CODE
+    if value == INVALID_CODE:
+        raise ValueError(f"{c!r} is not a letter")
+    return str(value)
 
 
-def alpha_array_to_int(array: np.ndarray, min_value: int = 0) -> str:
+def alpha_array_to_int(array: np.ndarray, min_value: int = 0) -> np.ndarray:
     if array.dtype != "<U1":
         raise ValueError("Input must be char array")
-    int_array = array.view(np.int32).copy()
-    is_lower = np.greater_equal(int_array, ord("a")) * np.less_equal(int_array, ord("z"))
-    is_upper = np.greater_equal(int_array, ord("A")) * np.less_equal(int_array, ord("Z"))
-    if not np.all(is_upper + is_lower):
+    # Codes of chars over 255 are not letters
+    codes = array.view(np.int32)
+    if np.any(codes > 255):
         raise ValueError("Array does not contain only chars")
-
-    int_array += (min_value - ord("a")) * is_lower + (min_value + 26 - ord("A")) * is_upper
-
-    return int_array
+    try:
+        return decode_bytes(codes.astype(np.uint8), alpha_table(min_value), dtype=np.int32)
+    except ValueError:
+        raise ValueError("Array does not contain only chars") from None
@@ -0,0 +1,33 @@
+import os
+import re
+from typing import Optional, Set, Union
+
+
+def flag(name: str) -> bool:
+    """Whether environment variable is set to anything but "" or "0" """
+    return os.environ.get(name, "0") not in ("", "0")
+
+
+def days(name: str) -> Union[bool, Set[int]]:
+    """Parse environment variable enabling a feature for all days ("1" or "all" --> True), no day ("" or "0" -->
+    False) or some days (comma-separated day numbers, e.g. "11,16" --> {11, 16})
+    """
+    value = os.environ.get(name, "0").strip().lower()
+    if value in ("", "0"):
+        return False
+    if value in ("1", "all"):
+        return True
+    return {int(day) for day in value.split(",")}
+
+
+def module_day(module: str) -> Optional[int]:
+    """Day of a solution module (e.g. "day07.solution" --> 7), None if not a day module"""
+    m = re.match(r"day(\d+)\b", module or "")
+    return None if m is None else int(m.group(1))
+
+
+def is_enabled_for(enabled_days: Union[bool, Set[int]], module: str) -> bool:
+    """Whether a feature enabled for enabled_days (as returned by days()) applies to module"""
+    if isinstance(enabled_days, bool):
+        return enabled_days
+    return module_day(module) in enabled_days
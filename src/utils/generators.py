@@ -0,0 +1,505 @@
+import json
+import math
+import os
+import random
+import string
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Where generated inputs are written
+DEFAULT_SYNTHETIC_DIR = os.path.join("output", "synthetic")
+
+# Generates input text of given size from a seeded random generator
+GeneratorFunction = Callable[[int, random.Random], str]
+# Extra solver arguments for input of given size (e.g. day15's row)
+KwargsFunction = Callable[[int], Dict]
+
+LETTERS = string.ascii_lowercase + string.ascii_uppercase
+
+
+@dataclass(frozen=True)
+class Generator:
+    """Seeded generator of valid synthetic inputs of a day, at any size. The meaning of size depends on the
+    day (e.g. number of sensors for day15, side of the forest for day08), see each generator.
+    """
+
+    day: int
+    generate: GeneratorFunction
+    # Sizes used when none are requested, from about the size of the real input upwards
+    default_sizes: Tuple[int, ...]
+    part_1_kwargs: Optional[KwargsFunction] = None
+    part_2_kwargs: Optional[KwargsFunction] = None
+
+    def text(self, size: int, seed: int = 0) -> str:
+        # Same day, size and seed always give the same input
+        return self.generate(size, random.Random(f"day{self.day}-{size}-{seed}"))
+
+    def kwargs(self, part: int, size: int) -> Dict:
+        """Solver arguments to use with input of given size"""
+        kwargs_function = self.part_1_kwargs if part == 1 else self.part_2_kwargs
+        return {} if kwargs_function is None else kwargs_function(size)
+
+    def write(self, size: int, seed: int = 0, directory: str = None) -> str:
+        """Write input to file, unless already generated
+
+        Args:
+            size (int): Input size
+            seed (int, optional): Random seed. Defaults to 0.
+            directory (str, optional): Output directory. Defaults to None (DEFAULT_SYNTHETIC_DIR).
+
+        Returns:
+            str: Input file path
+        """
+        directory = directory or DEFAULT_SYNTHETIC_DIR
+        path = os.path.join(directory, f"day{self.day:02d}-{size}-{seed}.txt")
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(self.text(size, seed))
+            os.replace(tmp_path, path)
+        return path
+
+
+GENERATORS: Dict[int, Generator] = {}
+
+
+def register(
+    day: int,
+    default_sizes: Tuple[int, ...],
+    part_1_kwargs: KwargsFunction = None,
+    part_2_kwargs: KwargsFunction = None,
+) -> Callable[[GeneratorFunction], GeneratorFunction]:
+    """Decorator registering the input generator of a day"""
+
+    def register_generator(generate: GeneratorFunction) -> GeneratorFunction:
+        GENERATORS[day] = Generator(
+            day=day,
+            generate=generate,
+            default_sizes=default_sizes,
+            part_1_kwargs=part_1_kwargs,
+            part_2_kwargs=part_2_kwargs,
+        )
+        return generate
+
+    return register_generator
+
+
+def get(day: int) -> Generator:
+    if day not in GENERATORS:
+        raise ValueError(f"No input generator for day {day}")
+    return GENERATORS[day]
+
+
+# Like real inputs, generated inputs have no trailing newline
+def _lines(lines: List[str]) -> str:
+    return "\n".join(lines)
+
+
+####################################
+# Generators
+####################################
+@register(day=1, default_sizes=(250, 2500, 25000, 250000))
+def generate_calories(n_elves: int, rng: random.Random) -> str:
+    elves = [
+        "\n".join(str(rng.randint(1000, 70000)) for __ in range(rng.randint(1, 15)))
+        for __ in range(n_elves)
+    ]
+    return "\n\n".join(elves)
+
+
+@register(day=2, default_sizes=(2500, 25000, 250000, 2500000))
+def generate_strategy_guide(n_rounds: int, rng: random.Random) -> str:
+    return _lines([f"{rng.choice('ABC')} {rng.choice('XYZ')}" for __ in range(n_rounds)])
+
+
+def _rucksack(rng: random.Random, badge: str, pool: List[str]) -> str:
+    # Halves only share the first letter of the pool, and the badge is only in one of them
+    common, first_letters, second_letters = pool[0], pool[1:9], pool[9:17]
+    half_size = rng.randint(4, 16)
+    first = [badge, common] + rng.choices(first_letters + [badge, common], k=half_size - 2)
+    second = [common] + rng.choices(second_letters + [common], k=half_size - 1)
+    rng.shuffle(first)
+    rng.shuffle(second)
+    if rng.random() < 0.5:
+        first, second = second, first
+    return "".join(first + second)
+
+
+@register(day=3, default_sizes=(300, 3000, 30000, 300000))
+def generate_rucksacks(n_rucksacks: int, rng: random.Random) -> str:
+    # Rucksacks of a group are filled from disjoint letter pools, so only the badge is common to all of them
+    lines = []
+    for __ in range(math.ceil(n_rucksacks / 3)):
+        letters = list(LETTERS)
+        rng.shuffle(letters)
+        badge, pools = letters[0], [letters[1:18], letters[18:35], letters[35:52]]
+        lines.extend(_rucksack(rng, badge, pool) for pool in pools)
+    return _lines(lines)
+
+
+@register(day=4, default_sizes=(1000, 10000, 100000, 1000000))
+def generate_section_pairs(n_pairs: int, rng: random.Random) -> str:
+    lines = []
+    for __ in range(n_pairs):
+        first = sorted(rng.randint(1, 99) for __ in range(2))
+        second = sorted(rng.randint(1, 99) for __ in range(2))
+        lines.append(f"{first[0]}-{first[1]},{second[0]}-{second[1]}")
+    return _lines(lines)
+
+
+@register(day=5, default_sizes=(500, 5000, 50000, 500000))
+def generate_crane_procedure(n_moves: int, rng: random.Random) -> str:
+    n_stacks = 9
+    height = max(8, n_moves // 60)
+    stacks = [
+        [rng.choice(string.ascii_uppercase) for __ in range(rng.randint(1, height))]
+        for __ in range(n_stacks)
+    ]
+
+    drawing = []
+    for level in reversed(range(max(len(stack) for stack in stacks))):
+        cells = [f"[{stack[level]}]" if level < len(stack) else "   " for stack in stacks]
+        drawing.append(" ".join(cells))
+    drawing.append(" ".join(f" {ind + 1} " for ind in range(n_stacks)))
+
+    # Moves never empty a stack, so that every stack has a top crate at the end
+    sizes = [len(stack) for stack in stacks]
+    moves = []
+    for __ in range(n_moves):
+        source = rng.choice([ind for ind, size in enumerate(sizes) if size > 1])
+        destination = rng.choice([ind for ind in range(n_stacks) if ind != source])
+        n_crates = rng.randint(1, min(sizes[source] - 1, 30))
+        sizes[source] -= n_crates
+        sizes[destination] += n_crates
+        moves.append(f"move {n_crates} from {source + 1} to {destination + 1}")
+
+    return _lines(drawing + [""] + moves)
+
+
+@register(day=6, default_sizes=(4000, 40000, 400000, 4000000))
+def generate_datastream(n_chars: int, rng: random.Random) -> str:
+    # No 4 distinct chars before the end, so both markers are found after scanning the whole stream
+    marker = list("defghijklmnopq")
+    rng.shuffle(marker)
+    return "".join(rng.choices("abc", k=max(0, n_chars - len(marker))) + marker)
+
+
+@register(day=7, default_sizes=(50, 200, 800, 3200))
+def generate_terminal_output(n_dirs: int, rng: random.Random) -> str:
+    # Parent of each new directory is one of the last created ones, which gives deep trees
+    children: List[List[int]] = [[] for __ in range(n_dirs)]
+    for ind in range(1, n_dirs):
+        parent = max(0, ind - 1 - int(rng.expovariate(0.5)))
+        children[parent].append(ind)
+
+    files = [
+        [
+            (f"f{ind}_{k}.{rng.choice(['txt', 'dat', 'log'])}", rng.randint(1000, 300000))
+            for k in range(rng.randint(0, 4))
+        ]
+        for ind in range(n_dirs)
+    ]
+    # Make sure the disk is full enough for part 2 to have something to delete
+    total_size = sum(size for dir_files in files for __, size in dir_files)
+    files[0].append(("big.bin", max(1000, 45000000 - total_size)))
+
+    lines = ["$ cd /"]
+    # Iterative DFS, as trees can be deeper than the recursion limit
+    stack: List[Tuple[int, int]] = [(0, -1)]
+    while stack:
+        ind, child_pos = stack.pop()
+        if child_pos == -1:
+            lines.append("$ ls")
+            lines.extend(f"dir d{child}" for child in children[ind])
+            lines.extend(f"{size} {name}" for name, size in files[ind])
+        if child_pos + 1 < len(children[ind]):
+            child = children[ind][child_pos + 1]
+            lines.append(f"$ cd d{child}")
+            stack.append((ind, child_pos + 1))
+            stack.append((child, -1))
+        elif ind != 0:
+            lines.append("$ cd ..")
+    return _lines(lines)
+
+
+@register(day=8, default_sizes=(100, 300, 1000, 3000))
+def generate_forest(side: int, rng: random.Random) -> str:
+    return _lines(["".join(rng.choices(string.digits, k=side)) for __ in range(side)])
+
+
+@register(day=9, default_sizes=(2000, 20000, 200000, 2000000))
+def generate_rope_moves(n_moves: int, rng: random.Random) -> str:
+    return _lines([f"{rng.choice('UDLR')} {rng.randint(1, 19)}" for __ in range(n_moves)])
+
+
+@register(day=10, default_sizes=(150, 1500, 15000, 150000))
+def generate_program(n_instructions: int, rng: random.Random) -> str:
+    # Keep sprite on screen
+    x = 1
+    lines = []
+    for __ in range(n_instructions):
+        if rng.random() < 0.3:
+            lines.append("noop")
+        else:
+            value = rng.randint(max(-20, -1 - x), min(20, 40 - x))
+            x += value
+            lines.append(f"addx {value}")
+    return _lines(lines)
+
+
+@register(day=11, default_sizes=(36, 360, 3600, 36000))
+def generate_monkeys(n_items: int, rng: random.Random) -> str:
+    # Monkey ids are parsed as a single digit
+    n_monkeys = 8
+    divisors = rng.sample([2, 3, 5, 7, 11, 13, 17, 19, 23], n_monkeys)
+    square_monkey = rng.randrange(n_monkeys)
+
+    items: List[List[int]] = [[rng.randint(50, 99)] for __ in range(n_monkeys)]
+    for __ in range(n_items - n_monkeys):
+        items[rng.randrange(n_monkeys)].append(rng.randint(50, 99))
+
+    blocks = []
+    for ind in range(n_monkeys):
+        if ind == square_monkey:
+            operation = "old * old"
+        elif rng.random() < 0.3:
+            operation = f"old * {rng.randint(2, 19)}"
+        else:
+            operation = f"old + {rng.randint(1, 8)}"
+        monkey_true, monkey_false = rng.sample([k for k in range(n_monkeys) if k != ind], 2)
+        blocks.append(
+            "\n".join(
+                [
+                    f"Monkey {ind}:",
+                    f"  Starting items: {', '.join(str(item) for item in items[ind])}",
+                    f"  Operation: new = {operation}",
+                    f"  Test: divisible by {divisors[ind]}",
+                    f"    If true: throw to monkey {monkey_true}",
+                    f"    If false: throw to monkey {monkey_false}",
+                ]
+            )
+        )
+    return "\n\n".join(blocks)
+
+
+@register(day=12, default_sizes=(50, 150, 500, 1500))
+def generate_heightmap(side: int, rng: random.Random) -> str:
+    # Elevation rises steadily from top left (S) to bottom right (E), so the staircase along the
+    # diagonal is always climbable. Other cells are randomly lowered, which creates obstacles.
+    side = max(side, 14)
+    lines = []
+    for y in range(side):
+        line = []
+        for x in range(side):
+            elevation = (x + y) * 25 // (2 * side - 2)
+            if x - y not in (0, 1) and rng.random() < 0.3:
+                elevation = rng.randint(0, elevation)
+            line.append(string.ascii_lowercase[elevation])
+        lines.append(line)
+    lines[0][0] = "S"
+    lines[-1][-1] = "E"
+    return _lines(["".join(line) for line in lines])
+
+
+def _packet(rng: random.Random, depth: int = 0) -> List:
+    items = []
+    for __ in range(rng.randint(0, 5)):
+        if depth < 4 and rng.random() < 0.3:
+            items.append(_packet(rng, depth + 1))
+        else:
+            items.append(rng.randint(0, 10))
+    return items
+
+
+@register(day=13, default_sizes=(150, 1500, 15000, 150000))
+def generate_packet_pairs(n_pairs: int, rng: random.Random) -> str:
+    pairs = [
+        "\n".join(json.dumps(_packet(rng), separators=(",", ":")) for __ in range(2))
+        for __ in range(n_pairs)
+    ]
+    return "\n\n".join(pairs)
+
+
+@register(day=14, default_sizes=(40, 150, 600, 2400))
+def generate_rock_paths(n_paths: int, rng: random.Random) -> str:
+    # Scanned area grows with the number of paths, so that paths stay about as sparse
+    half_width = 10 + int(8 * math.sqrt(n_paths))
+    depth = 10 + int(12 * math.sqrt(n_paths))
+    max_segment_length = max(3, half_width // 10)
+    # Leave room below the source, as in real inputs
+    min_depth = max(2, depth // 4)
+
+    lines = []
+    for __ in range(n_paths):
+        x, y = rng.randint(500 - half_width, 500 + half_width), rng.randint(min_depth, depth)
+        corners = [(x, y)]
+        horizontal = rng.random() < 0.5
+        for __ in range(rng.randint(1, 5)):
+            length = rng.choice([-1, 1]) * rng.randint(1, max_segment_length)
+            if horizontal:
+                x = min(max(x + length, 500 - half_width), 500 + half_width)
+            else:
+                y = min(max(y + length, min_depth), depth)
+            if (x, y) != corners[-1]:
+                corners.append((x, y))
+            horizontal = not horizontal
+        if len(corners) < 2:
+            corners.append((x, y + 1))
+        lines.append(" -> ".join(f"{x},{y}" for x, y in corners))
+    return _lines(lines)
+
+
+# Sensors are scattered on a grid which grows with their number
+def _day15_grid_size(n_sensors: int) -> int:
+    return 20 * n_sensors
+
+
+@register(
+    day=15,
+    default_sizes=(25, 250, 2500, 25000),
+    part_1_kwargs=lambda n_sensors: {"row": _day15_grid_size(n_sensors) // 2},
+    part_2_kwargs=lambda n_sensors: {"grid_size": _day15_grid_size(n_sensors)},
+)
+def generate_sensor_readings(n_sensors: int, rng: random.Random) -> str:
+    grid_size = _day15_grid_size(n_sensors)
+    lines = []
+    for __ in range(n_sensors):
+        sensor_x, sensor_y = rng.randint(0, grid_size), rng.randint(0, grid_size)
+        distance = rng.randint(grid_size // 8, grid_size // 3)
+        dx = rng.randint(-distance, distance)
+        dy = rng.choice([-1, 1]) * (distance - abs(dx))
+        lines.append(
+            f"Sensor at x={sensor_x}, y={sensor_y}: closest beacon is at"
+            f" x={sensor_x + dx}, y={sensor_y + dy}"
+        )
+    return _lines(lines)
+
+
+@register(day=16, default_sizes=(15, 30, 60, 120))
+def generate_valves(n_valves: int, rng: random.Random) -> str:
+    # Valve names are 2 uppercase letters, AA being the start
+    names = ["AA"] + rng.sample(
+        [a + b for a in string.ascii_uppercase for b in string.ascii_uppercase if a + b != "AA"],
+        min(n_valves, 26 * 26) - 1,
+    )
+
+    # Random spanning tree, plus a few shortcuts
+    tunnels = {name: set() for name in names}
+    for ind in range(1, len(names)):
+        other = names[rng.randrange(ind)]
+        tunnels[names[ind]].add(other)
+        tunnels[other].add(names[ind])
+    for __ in range(len(names) // 4):
+        first, second = rng.sample(names, 2)
+        tunnels[first].add(second)
+        tunnels[second].add(first)
+
+    # As in real inputs, only about a quarter of the valves have a flow rate
+    lines = []
+    for name in names:
+        flow_rate = rng.randint(2, 25) if name != "AA" and rng.random() < 0.25 else 0
+        neighbors = sorted(tunnels[name])
+        if len(neighbors) == 1:
+            tunnels_str = f"tunnel leads to valve {neighbors[0]}"
+        else:
+            tunnels_str = f"tunnels lead to valves {', '.join(neighbors)}"
+        lines.append(f"Valve {name} has flow rate={flow_rate}; {tunnels_str}")
+    return _lines(lines)
+
+
+@register(day=17, default_sizes=(1000, 10000, 100000, 1000000))
+def generate_jet_pattern(n_jets: int, rng: random.Random) -> str:
+    return "".join(rng.choices("<>", k=n_jets))
+
+
+@register(day=18, default_sizes=(300, 3000, 30000, 300000))
+def generate_lava_cubes(n_cubes: int, rng: random.Random) -> str:
+    # Half-filled cube, which leaves many air pockets. Coordinates start at 1, as in real inputs
+    side = math.ceil((2 * n_cubes) ** (1 / 3))
+    cubes = rng.sample(range(side**3), n_cubes)
+    return _lines(
+        [f"{cube // side**2 + 1},{cube // side % side + 1},{cube % side + 1}" for cube in cubes]
+    )
+
+
+# Sizes dividing 1000 would make all grove coordinates the 0 itself
+@register(day=20, default_sizes=(700, 1400, 2800, 5600))
+def generate_encrypted_file(n_numbers: int, rng: random.Random) -> str:
+    numbers = [rng.choice([-1, 1]) * rng.randint(1, 10000) for __ in range(n_numbers - 1)]
+    numbers.insert(rng.randrange(n_numbers), 0)
+    return _lines([str(number) for number in numbers])
+
+
+def _split_number(rng: random.Random, value: int) -> Tuple[int, str, int]:
+    """Random operation (and its positive integer arguments) giving value, with no rounding"""
+    divisors = [d for d in range(2, 10) if value % d == 0]
+    operators = ["-"] + (["+"] if value > 1 else []) + (["*"] if divisors else [])
+    if value < 10**12:
+        operators.append("/")
+
+    operator = rng.choice(operators)
+    if operator == "+":
+        first = rng.randint(1, value - 1)
+        return first, operator, value - first
+    if operator == "-":
+        second = rng.randint(1, 1000)
+        return value + second, operator, second
+    if operator == "*":
+        divisor = rng.choice(divisors)
+        return (value // divisor, operator, divisor)[:: rng.choice([-1, 1])]
+    divisor = rng.randint(2, 5)
+    return value * divisor, operator, divisor
+
+
+@register(day=21, default_sizes=(2000, 20000, 200000))
+def generate_monkey_riddle(n_monkeys: int, rng: random.Random) -> str:
+    # Expression tree built top-down from the value each monkey must yell, with exact divisions. Both
+    # sides of root yell the same value, so the answer of part 2 is the number yelled by humn.
+    n_math_monkeys = max(1, (n_monkeys - 1) // 2)
+    # Unique 4-letter names
+    name_indices = rng.sample(range(26**4), 2 * n_math_monkeys + 3)
+    names = [
+        "".join(string.ascii_lowercase[ind // 26**k % 26] for k in range(4)) for ind in name_indices
+    ]
+    names = [name for name in names if name not in ("root", "humn")][: 2 * n_math_monkeys]
+
+    value = rng.randint(1000, 1000000)
+    # Leaves are (name, value), expanded in random order
+    leaves = [(names.pop(), value), (names.pop(), value)]
+    lines = [f"root: {leaves[0][0]} + {leaves[1][0]}"]
+    for __ in range(n_math_monkeys - 1):
+        leaf_ind = rng.randrange(len(leaves))
+        leaves[leaf_ind], leaves[-1] = leaves[-1], leaves[leaf_ind]
+        name, value = leaves.pop()
+
+        first, operator, second = _split_number(rng, value)
+        first_name, second_name = names.pop(), names.pop()
+        lines.append(f"{name}: {first_name} {operator} {second_name}")
+        leaves.extend([(first_name, first), (second_name, second)])
+
+    human_name, human_value = leaves[rng.randrange(len(leaves))]
+    leaves.remove((human_name, human_value))
+    leaves.append(("humn", human_value))
+    # All names have 4 letters, so this only replaces the name of the human in its parent
+    lines = [line.replace(human_name, "humn") for line in lines]
+    lines.extend(f"{name}: {value}" for name, value in leaves)
+
+    rng.shuffle(lines)
+    return _lines(lines)
+
+
+def _to_snafu(value: int) -> str:
+    digits = []
+    while value:
+        digit = (value + 2) % 5 - 2
+        digits.append("=-012"[digit + 2])
+        value = (value - digit) // 5
+    return "".join(reversed(digits))
+
+
+@register(day=25, default_sizes=(120, 1200, 12000, 120000))
+def generate_snafu_numbers(n_numbers: int, rng: random.Random) -> str:
+    # Sum must fit in the 20 digits handled by the solver. Values are log-uniform, as in real inputs
+    max_value = max(10, 10**14 // n_numbers)
+    return _lines([_to_snafu(int(max_value ** rng.random())) for __ in range(n_numbers)])
@@ -0,0 +1,131 @@
+"""Import time measurement of modules, in fresh interpreters.
+
+Report import times of solution modules (in the style of python -X importtime) from the repository root:
+    PYTHONPATH=src python -m utils.importtime [days] [--min-ms 1]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+import utils.run
+
+# Written to stderr right before the measured import, to separate it from interpreter startup imports
+_MARKER = "--- measured import ---"
+
+
+@dataclass
+class ImportTime:
+    module: str
+    # Time spent importing the module itself, and including its own imports (in seconds)
+    self_time: float
+    cumulative_time: float
+    # Nesting level (0 for modules imported by the measured import statement itself)
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    module: str
+    # Wall time of the import statement, in seconds
+    total_time: float
+    # In the order they finished importing, i.e. nested imports before their parent
+    imports: List[ImportTime] = field(default_factory=list)
+
+    def report(self, min_time: float = 1e-3) -> str:
+        """Text report of imports taking at least min_time, like python -X importtime"""
+        lines = [
+            f"{self.module}: {self.total_time * 1e3:.1f} ms",
+            f"{'self ms':>9} {'cumul ms':>9} module",
+        ]
+        for entry in self.imports:
+            if entry.cumulative_time >= min_time:
+                lines.append(
+                    f"{entry.self_time * 1e3:>9.1f} {entry.cumulative_time * 1e3:>9.1f}"
+                    f" {'  ' * entry.depth}{entry.module}"
+                )
+        return "\n".join(lines)
+
+
+def _parse_importtime(stderr: str) -> List[ImportTime]:
+    imports = []
+    lines = stderr.splitlines()
+    measured_lines = lines[lines.index(_MARKER) + 1 :] if _MARKER in lines else lines
+    for line in measured_lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        indent = len(name) - len(name.lstrip())
+        imports.append(
+            ImportTime(
+                module=name.strip(),
+                self_time=int(self_us) * 1e-6,
+                cumulative_time=int(cumulative_us) * 1e-6,
+                depth=(indent - 1) // 2,
+            )
+        )
+    return imports
+
+
+def measure_import(module: str, repeats: int = 1) -> ImportReport:
+    """Import module in fresh interpreters, and keep the fastest import
+
+    Args:
+        module (str): Module name (e.g. "day02.solution")
+        repeats (int, optional): Number of interpreters. Defaults to 1.
+
+    Returns:
+        ImportReport: Import time of module and of each module it imported
+    """
+    code = (
+        "import sys, time\n"
+        f"sys.stderr.write({_MARKER!r} + '\\n')\n"
+        "sys.stderr.flush()\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    python_path = os.pathsep.join(filter(None, [utils.run.SRC_DIR, os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "PYTHONPATH": python_path}
+
+    best = None
+    for __ in range(repeats):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        report = ImportReport(
+            module=module,
+            total_time=float(process.stdout.split()[-1]),
+            imports=_parse_importtime(process.stderr),
+        )
+        if best is None or report.total_time < best.total_time:
+            best = report
+    return best
+
+
+def main(args: Sequence[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Report import times of solution modules")
+    parser.add_argument("days", type=int, nargs="*", help="Days to report (default: all)")
+    parser.add_argument("--repeats", type=int, default=3, help="Fastest of this many imports")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="Hide faster imports")
+    options = parser.parse_args(args)
+
+    reports = [
+        measure_import(f"{utils.run.day_string(day)}.solution", repeats=options.repeats)
+        for day in options.days or utils.run.find_days()
+    ]
+    for report in reports:
+        print(report.report(min_time=options.min_ms * 1e-3), end="\n\n")
+    for report in reports:
+        print(f"{report.module:<16} {report.total_time * 1e3:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
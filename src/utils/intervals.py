@@ -0,0 +1,220 @@
+"""Closed integer intervals stored as numpy arrays, for working on many intervals without a python object each.
+
+IntervalSet is a union of disjoint intervals (i.e. a set of integers), IntervalArray a sequence of independent
+intervals compared element-wise, and first_uncovered finds gaps in many unions at once.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, Tuple, Union
+
+import utils.lazy
+
+np = utils.lazy.lazy_import("numpy")
+
+
+def _as_int_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.int64).reshape(-1)
+
+
+class IntervalSet:
+    """Union of disjoint closed integer intervals [start, end], stored as sorted start and end arrays. Intervals
+    are normalized: none are empty, and touching ones (e.g. [1, 3] and [4, 5]) are merged.
+    """
+
+    def __init__(self, starts=(), ends=(), normalized: bool = False) -> None:
+        """
+        Args:
+            starts (optional): Start of each interval. Defaults to () (empty set).
+            ends (optional): End of each interval (included). Defaults to () (empty set).
+            normalized (bool, optional): Whether intervals are already sorted, disjoint, non-touching and not
+                empty, in which case they are used as is. Defaults to False.
+        """
+        starts, ends = _as_int_array(starts), _as_int_array(ends)
+        if len(starts) != len(ends):
+            raise ValueError("Intervals need as many starts as ends")
+        if not normalized:
+            starts, ends = self.__normalize(starts, ends)
+        self.starts: np.ndarray = starts
+        self.ends: np.ndarray = ends
+
+    @staticmethod
+    def __normalize(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Sort and merge intervals"""
+        not_empty = starts <= ends
+        starts, ends = starts[not_empty], ends[not_empty]
+        if not len(starts):
+            return starts, ends
+
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], ends[order]
+        # An interval starts a new group if it starts after the end of all previous ones (+1, as they would touch)
+        reach = np.maximum.accumulate(ends)
+        group_starts = np.flatnonzero(np.concatenate(([True], starts[1:] > reach[:-1] + 1)))
+        group_ends = np.concatenate((group_starts[1:] - 1, [len(starts) - 1]))
+        return starts[group_starts], reach[group_ends]
+
+    @classmethod
+    def from_pairs(cls, pairs) -> IntervalSet:
+        """Union of intervals given as (N, 2) array of (start, end) rows"""
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        return cls(pairs[:, 0], pairs[:, 1])
+
+    @classmethod
+    def closed(cls, start: int, end: int) -> IntervalSet:
+        return cls([start], [end])
+
+    @classmethod
+    def empty(cls) -> IntervalSet:
+        return cls()
+
+    def __len__(self) -> int:
+        """Number of disjoint intervals"""
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts.tolist(), self.ends.tolist())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, IntervalSet):
+            return np.array_equal(self.starts, other.starts) and np.array_equal(
+                self.ends, other.ends
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    def length(self) -> int:
+        """Number of integers in set"""
+        return int((self.ends - self.starts + 1).sum())
+
+    def lower(self) -> int:
+        return int(self.starts[0]) if len(self) else None
+
+    def upper(self) -> int:
+        return int(self.ends[-1]) if len(self) else None
+
+    def __or__(self, other: IntervalSet) -> IntervalSet:
+        return IntervalSet(
+            np.concatenate((self.starts, other.starts)), np.concatenate((self.ends, other.ends))
+        )
+
+    def __and__(self, other: IntervalSet) -> IntervalSet:
+        # Each interval overlaps a contiguous range of the other set's (sorted, disjoint) intervals
+        first = np.searchsorted(other.ends, self.starts, side="left")
+        last = np.searchsorted(other.starts, self.ends, side="right")
+        counts = np.maximum(last - first, 0)
+        own = np.repeat(np.arange(len(self)), counts)
+        others = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        others += np.repeat(first, counts)
+        starts = np.maximum(self.starts[own], other.starts[others])
+        ends = np.minimum(self.ends[own], other.ends[others])
+        # Already sorted and disjoint, but may touch
+        return IntervalSet(starts, ends)
+
+    def complement(self, start: int, end: int) -> IntervalSet:
+        """Integers of [start, end] not in set"""
+        inside = self & IntervalSet.closed(start, end)
+        gap_starts = np.concatenate(([start], inside.ends + 1))
+        gap_ends = np.concatenate((inside.starts - 1, [end]))
+        not_empty = gap_starts <= gap_ends
+        return IntervalSet(gap_starts[not_empty], gap_ends[not_empty], normalized=True)
+
+    def __sub__(self, other: IntervalSet) -> IntervalSet:
+        if not len(self):
+            return self
+        return self & other.complement(self.lower(), self.upper())
+
+    def contains(self, points) -> np.ndarray:
+        """Whether each point is in set"""
+        points = _as_int_array(points)
+        return points <= self.__end_of_start(points)
+
+    def contains_intervals(self, starts, ends) -> np.ndarray:
+        """Whether each interval [starts[i], ends[i]] is in set (empty intervals are not)"""
+        starts, ends = _as_int_array(starts), _as_int_array(ends)
+        return (starts <= ends) & (ends <= self.__end_of_start(starts))
+
+    def __end_of_start(self, points: np.ndarray) -> np.ndarray:
+        """End of the interval starting before or at each point"""
+        if not len(self):
+            return np.full(len(points), np.iinfo(np.int64).min)
+        ind = np.searchsorted(self.starts, points, side="right") - 1
+        return np.where(ind >= 0, self.ends[np.maximum(ind, 0)], np.iinfo(np.int64).min)
+
+    def __contains__(self, item: Union[int, Tuple[int, int], IntervalSet]) -> bool:
+        """Whether an integer, an interval (start, end) or all intervals of a set are in set"""
+        if isinstance(item, IntervalSet):
+            return bool(self.contains_intervals(item.starts, item.ends).all())
+        if isinstance(item, tuple):
+            return bool(self.contains_intervals([item[0]], [item[1]])[0])
+        return bool(self.contains([item])[0])
+
+
+class IntervalArray:
+    """Sequence of independent closed integer intervals [start, end], compared element-wise with another one"""
+
+    def __init__(self, starts, ends) -> None:
+        self.starts: np.ndarray = _as_int_array(starts)
+        self.ends: np.ndarray = _as_int_array(ends)
+        if len(self.starts) != len(self.ends):
+            raise ValueError("Intervals need as many starts as ends")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def lengths(self) -> np.ndarray:
+        return np.maximum(self.ends - self.starts + 1, 0)
+
+    def contains(self, other: IntervalArray) -> np.ndarray:
+        """Whether each interval contains the interval of same index of other"""
+        return (self.starts <= other.starts) & (other.ends <= self.ends)
+
+    def overlaps(self, other: IntervalArray) -> np.ndarray:
+        """Whether each interval shares at least an integer with the interval of same index of other"""
+        return (self.starts <= other.ends) & (other.starts <= self.ends)
+
+    def to_set(self) -> IntervalSet:
+        """Union of all intervals"""
+        return IntervalSet(self.starts, self.ends)
+
+
+def first_uncovered(starts: np.ndarray, ends: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Smallest integer of [start, end] outside of the union of each row of intervals, for many rows at once
+    (e.g. the coverage of each row of a map by a few sensors)
+
+    Args:
+        starts (np.ndarray): (R, K) array of interval starts (empty intervals, i.e. starting after their end, are
+            ignored)
+        ends (np.ndarray): (R, K) array of interval ends
+        start (int): Start of searched range
+        end (int): End of searched range
+
+    Returns:
+        np.ndarray: R integers, end + 1 for rows covering the whole range
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    # Empty intervals become intervals before the searched range, which cover nothing in it
+    empty = starts > ends
+    starts = np.where(empty, start - 1, starts)
+    ends = np.where(empty, start - 1, ends)
+
+    order = np.argsort(starts, axis=1)
+    starts = np.take_along_axis(starts, order, axis=1)
+    ends = np.take_along_axis(ends, order, axis=1)
+
+    # Sweep intervals by increasing start, keeping the end of the covered prefix of each row
+    reach = np.full(len(starts), start - 1, dtype=np.int64)
+    found = np.full(len(starts), end + 1, dtype=np.int64)
+    for k in range(starts.shape[1]):
+        is_gap = (starts[:, k] > reach + 1) & (found > end)
+        found[is_gap] = reach[is_gap] + 1
+        reach = np.maximum(reach, ends[:, k])
+    is_gap = (reach < end) & (found > end)
+    found[is_gap] = reach[is_gap] + 1
+    return np.minimum(found, end + 1)
@@ -1,13 +1,104 @@
+from __future__ import annotations
+
+import itertools
+import mmap
+import os
 import re
 from dataclasses import dataclass
-from typing import Any, Callable, List, Type, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Type, Union
+
+import utils.cache
+import utils.lazy
 
-import numpy as np
+multiprocessing = utils.lazy.lazy_import("multiprocessing")
+np = utils.lazy.lazy_import("numpy")
 
 InputData = Union[str, List[str]]
 
 InputDataList = List[InputData]
 
+# Parsed inputs, keyed by input file content and parsing configuration
+parse_cache = utils.cache.DiskCache("parsed_input")
+
+
+# Size of blocks read by streaming iterators (in chars)
+READ_BLOCK_SIZE = 1 << 20
+
+
+def _iter_line_blocks(path: str) -> Iterator[List[str]]:
+    """Lazily yields the lines of a text file, by blocks of lines read at once, so that only a block is held in
+    memory. Lines are the same as those of f.read().split("\n") (i.e. a trailing newline yields a last empty line)
+
+    Args:
+        path (str): file path
+
+    Yields:
+        List[str]: Lines of a block, without their line ending
+    """
+    with open(path) as f:
+        # Last line of a block may continue in the next one
+        pending = ""
+        while block := f.read(READ_BLOCK_SIZE):
+            lines = (pending + block).split("\n")
+            pending = lines.pop()
+            if lines:
+                yield lines
+        yield [pending]
+
+
+def _read_lines(path: str, start: int = 0, end: int = None) -> List[str]:
+    """Lines of a text file, as f.read().split("\n")
+
+    Args:
+        path (str): file path
+        start (int, optional): Byte offset of the first line to read. Must be a line start. Defaults to 0.
+        end (int, optional): Byte offset (exclusive) at which to stop reading. Must be a line start.
+            Defaults to None (end of file).
+
+    Returns:
+        List[str]: Each line of the file (or of the byte range), without its line ending
+    """
+    if start == 0 and end is None:
+        with open(path) as f:
+            return f.read().split("\n")
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        content = f.read(-1 if end is None else end - start)
+    lines = content.decode().replace("\r\n", "\n").split("\n")
+    if end is not None:
+        # Range ends with a line ending, not with the empty last line of the file
+        lines.pop()
+    return lines
+
+
+def _process_lines(
+    lines: List[str], split: str = None, parse_as_type: Type = None
+) -> InputDataList:
+    if split is not None:
+        lines = [line.split(split) for line in lines]
+    if parse_as_type is not None:
+        lines = [parse_as_type(line) for line in lines]
+    return lines
+
+
+def iter_file_lines(
+    path: str, split: str = None, parse_as_type: Type = None
+) -> Iterator[InputData]:
+    """Lazy version of read_file_lines. Lines are read and processed by blocks, so that only
+    a block of lines is held in memory
+
+    Args:
+        path (str): file path
+        split (str, optional): Separator used on each line. Defaults to None (not split).
+        parse_as_type (Type, optional): Create an object of this type with each (optionally separated) line. Defaults to None (not parsed as type).
+
+    Yields:
+        InputData: String (if not separator) or list of separated strings from a single line
+    """
+    for lines in _iter_line_blocks(path):
+        yield from _process_lines(lines, split, parse_as_type)
+
 
 def read_file_lines(path: str, split: str = None, parse_as_type: Type = None) -> InputDataList:
     """Reads all lines of a text file independently
@@ -20,18 +111,11 @@ def read_file_lines(path: str, split: str = None, parse_as_type: Type = None) ->
     Returns:
         StrContainer: List with each item being a string (if not separator) or list of separated strings from a single line
     """
-    with open(path) as f:
-        data = f.read()
-        data = data.split("\n")
-        if split is not None:
-            data = [line.split(split) for line in data]
-        if parse_as_type is not None:
-            data = [parse_as_type(d) for d in data]
-        return data
+    return _process_lines(_read_lines(path), split, parse_as_type)
 
 
 def read_file_as_array(
-    path: str, dtype: Type = float, delimiter: Union[str, int] = 1
+    path: str, dtype: Type = float, delimiter: Union[str, int] = 1, use_cache: bool = False
 ) -> np.ndarray:
     """Read file as numpy array
 
@@ -39,11 +123,207 @@ def read_file_as_array(
         path (str): file path
         dtype (Type, optional): Data type. Defaults to float.
         delimiter (Union[str, int], optional): . Defaults to 1.
+        use_cache (bool, optional): Whether to look up/store the array in the parse cache. Defaults to False.
 
     Returns:
         np.ndarray: Array read from file
     """
-    return np.genfromtxt(path, delimiter=delimiter, dtype=dtype)
+
+    def _read():
+        return np.genfromtxt(path, delimiter=delimiter, dtype=dtype)
+
+    if not use_cache:
+        return _read()
+
+    key = utils.cache.hash_bytes(
+        "read_file_as_array", utils.cache.hash_file(path), np.dtype(dtype).str, delimiter
+    )
+    return parse_cache.get_or_compute(key, _read)
+
+
+def scan_file(
+    path: str, regex: Union[str, bytes, re.Pattern], convert: Callable[[Any], Any] = None
+) -> Iterator[Tuple[Any, ...]]:
+    r"""Lazily yields the catch groups of all regex matches in a file. The pattern is compiled once
+    and matched over the whole file content, instead of splitting it into lines and matching each one.
+    e.g. regex = "(\d+)-(\d+)", file = "1-2\n3-4", convert=int --> (1, 2), (3, 4)
+
+    Args:
+        path (str): file path
+        regex (Union[str, bytes, re.Pattern]): regex (or compiled pattern) with catch groups. Multiline mode is
+            enabled for uncompiled regexes. If bytes, the memory-mapped file is scanned without decoding it and groups
+            are bytes.
+        convert (Callable[[Any], Any], optional): Function applied to each group (e.g. int). Defaults to None (groups
+            are yielded as is).
+
+    Yields:
+        Tuple[Any, ...]: Catch groups of a match
+    """
+    pattern = regex if isinstance(regex, re.Pattern) else re.compile(regex, re.MULTILINE)
+
+    def _scan(content: Union[str, mmap.mmap]) -> Iterator[Tuple[Any, ...]]:
+        for m in pattern.finditer(content):
+            yield m.groups() if convert is None else tuple(map(convert, m.groups()))
+
+    if not isinstance(pattern.pattern, bytes):
+        with open(path) as f:
+            yield from _scan(f.read())
+        return
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from _scan(buffer)
+
+
+def read_file_as_columns(
+    path: str,
+    regex: str,
+    dtypes: Dict[str, Type] = None,
+    as_dict: bool = False,
+    batch_size: int = 1 << 16,
+) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+    r"""Read all regex matches of a file as columns, without creating one object per match.
+    e.g. regex = "(?P<x>\d+),(?P<y>\d+)", file = "1,2\n3,4" --> array([(1, 2), (3, 4)], dtype=[("x", "<i8"), ("y", "<i8")])
+
+    Args:
+        path (str): file path
+        regex (str): regex with named catch groups, matched over the whole file. Each named group is a column.
+        dtypes (Dict[str, Type], optional): Data type of each column (e.g. {"direction": "U1"}). Unsized str and
+            bytes types get the width of the longest match of their column. Defaults to None (all columns are
+            np.int64).
+        as_dict (bool, optional): Whether to return a dict of column arrays instead of a structured array.
+            Defaults to False.
+        batch_size (int, optional): Number of matches converted at a time, to limit memory usage. Defaults to 65536.
+
+    Returns:
+        Union[np.ndarray, Dict[str, np.ndarray]]: Structured array with one field per named group, or dict of columns
+    """
+    pattern = re.compile(regex.encode(), re.MULTILINE)
+    names = sorted(pattern.groupindex, key=pattern.groupindex.get)
+    if not names:
+        raise ValueError("Regex must have named groups")
+    dtypes = {name: np.dtype((dtypes or {}).get(name, np.int64)) for name in names}
+
+    def _to_columns(matches: List[Tuple[bytes, ...]]) -> List[np.ndarray]:
+        # Conversion from bytes is done by numpy, for whole columns at once
+        raw_columns = zip(*matches) if len(names) > 1 else [matches]
+        return [np.array(c, dtype=bytes).astype(dtypes[n]) for n, c in zip(names, raw_columns)]
+
+    batches = []
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                matches = []
+                for m in pattern.finditer(buffer):
+                    matches.append(m.group(*names))
+                    if len(matches) == batch_size:
+                        batches.append(_to_columns(matches))
+                        matches = []
+                if matches:
+                    batches.append(_to_columns(matches))
+
+    columns = {
+        name: np.concatenate([b[ind] for b in batches]) if batches else np.empty(0, dtypes[name])
+        for ind, name in enumerate(names)
+    }
+    if as_dict:
+        return columns
+
+    # Column dtypes are sized, unlike unsized str/bytes requested types (e.g. np.dtype(str) is "<U0")
+    array = np.empty(len(columns[names[0]]), dtype=[(name, columns[name].dtype) for name in names])
+    for name in names:
+        array[name] = columns[name]
+    return array
+
+
+def _grid_view(buffer: np.ndarray) -> np.ndarray:
+    """View raw bytes of a text file as a 2D array of char codes, skipping line endings (no copy)
+
+    Args:
+        buffer (np.ndarray): 1D uint8 array with file content
+
+    Returns:
+        np.ndarray: 2D uint8 array of shape (n_rows, n_columns)
+    """
+    # Row stride is given by first line ending
+    width = None
+    search_size = 1 << 16
+    for chunk_start in range(0, buffer.size, search_size):
+        chunk = buffer[chunk_start : chunk_start + search_size]
+        newlines = np.flatnonzero(chunk == ord("\n"))
+        if newlines.size:
+            width = chunk_start + int(newlines[0])
+            break
+
+    if width is None:
+        # Single line
+        return buffer.reshape(1, -1)
+
+    stride = width + 1
+    if width > 0 and buffer[width - 1] == ord("\r"):
+        width -= 1
+
+    # Works whether or not the last row has a line ending
+    n_rows = (buffer.size + stride - width) // stride
+    row_ends = buffer[stride - 1 : (n_rows - 1) * stride : stride]
+    # Last row is complete, with or without its line ending
+    is_complete = buffer.size in (n_rows * stride, n_rows * stride - (stride - width))
+    if not is_complete or np.any(row_ends != ord("\n")):
+        raise ValueError("All grid rows must have the same length")
+
+    return np.lib.stride_tricks.as_strided(
+        buffer,
+        shape=(n_rows, width),
+        strides=(stride * buffer.strides[0], buffer.strides[0]),
+        writeable=buffer.flags.writeable,
+    )
+
+
+def read_file_as_grid(
+    path: str, digits: bool = False, memory_map: bool = False, comments: str = None
+) -> np.ndarray:
+    """Read a file where each line has the same number of single char cells (e.g. digit or char
+    maps), without any per-cell processing.
+
+    Args:
+        path (str): file path
+        digits (bool, optional): Whether to decode cells as digits (i.e. "7" --> 7), which copies the grid.
+            Defaults to False (char codes, i.e. "a" --> 97).
+        memory_map (bool, optional): Whether to memory-map the file instead of reading it, for grids larger than RAM.
+            Returned char code array is then a read-only view into the file. Cannot be used with digits or comments,
+            which need the whole grid in memory. Defaults to False.
+        comments (str, optional): Char starting comments, which are removed up to the end of their line (as done by
+            np.genfromtxt). Files are scanned for it, and copied if they have comments. Defaults to None (no comments).
+
+    Returns:
+        np.ndarray: 2D uint8 array of shape (n_rows, n_columns)
+    """
+    if memory_map:
+        if digits or comments is not None:
+            raise ValueError(
+                "Memory-mapped grids cannot be decoded as digits or stripped of comments"
+            )
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+
+    if comments is not None and np.any(buffer == ord(comments)):
+        lines = bytes(buffer).split(b"\n")
+        # Line endings of commented lines are kept
+        lines = [
+            line.split(comments.encode())[0] + (b"\r" if line.endswith(b"\r") else b"")
+            for line in lines
+        ]
+        buffer = np.frombuffer(b"\n".join(lines), dtype=np.uint8).copy()
+
+    grid = _grid_view(buffer)
+    if digits:
+        grid = grid - ord("0")
+        if np.any(grid > 9):
+            raise ValueError("Grid does not contain only digits")
+    return grid
 
 
 @dataclass
@@ -57,8 +337,10 @@ class FileParser:
         line_sep: str = None,
         line_regex: str = None,
         line_group_size: int = 1,
+        workers: int = 1,
+        use_cache: bool = False,
     ) -> None:
-        """
+        r"""
         Init method. Defines operations applied to file lines to group/split/etc. them into data chunks that are then parsed
         Args:
             data_parser (Callable[[StrData],Any]): Function parsing aggregated/processed data chunks into an object. (i.e. how to parse data chunks,
@@ -69,12 +351,108 @@ class FileParser:
                 e.g. regex = "(\w{3})\w{3}(\w{3})", string = "ABCDEFGHI" --> ["ABC", "GHI"].
                 Defaults to None (no regex matching)
             line_group_size (int, optional): _description_. Defaults to 1.
+            workers (int, optional): Number of processes used by parse_file. When > 1, the file is split into
+                byte ranges aligned on line groups, which are parsed in parallel. data_parser and parsed objects must
+                then be picklable (e.g. data_parser is a top-level function). Defaults to 1 (parsed in current process).
+            use_cache (bool, optional): Whether parse_file looks up/stores its result in the on-disk parse cache.
+                Entries are keyed by file content, this configuration, data_parser (including its code, closure
+                values and the source of its module) and the sources of utils. Opt-in, so that solver time budgets
+                and benchmarks time parsing rather than cache hits. Defaults to False.
         """
         self.data_parser = data_parser
         self.strip_empty_lines = strip_empty_lines
         self.line_sep = line_sep
         self.line_regex = line_regex
+        self._line_pattern = None if line_regex is None else re.compile(line_regex)
         self.line_group_size = line_group_size
+        self.workers = workers
+        self.use_cache = use_cache
+
+    def _parse_lines(self, lines: List[str]) -> List[Any]:
+        data = lines
+        if self.strip_empty_lines:
+            data = [d for d in data if d]
+
+        if self.line_sep is not None:
+            data = [line.split(self.line_sep) for line in data]
+
+        if self.line_regex is not None:
+            data = [self._line_pattern.match(line).groups() for line in data]
+
+        group_size = self.line_group_size
+        if group_size > 1:
+            data = [data[i : i + group_size] for i in range(0, len(data), group_size)]
+
+        return [self.data_parser(d) for d in data]
+
+    def iter_file(self, path: str) -> Iterator[Any]:
+        """Lazily parse file using current configuration. Lines are streamed from the file by blocks,
+        so that only a block of lines is held in memory.
+
+        Args:
+            path (str): Path to file
+
+        Yields:
+            Any: Object obtained from parsing each aggregated/processed group of lines in the input file
+        """
+        group_size = max(1, self.line_group_size)
+        # Lines of a group may be split between blocks
+        pending = []
+        for lines in _iter_line_blocks(path):
+            if self.strip_empty_lines:
+                lines = [line for line in lines if line]
+            lines = pending + lines
+            n_grouped = len(lines) - len(lines) % group_size
+            pending = lines[n_grouped:]
+            yield from self._parse_lines(lines[:n_grouped])
+
+        # Last group may be incomplete
+        yield from self._parse_lines(pending)
+
+    def _parse_chunk(self, path: str, start: int, end: int) -> List[Any]:
+        return self._parse_lines(_read_lines(path, start, end))
+
+    def _chunk_ranges(self, path: str, n_chunks: int) -> List[Tuple[int, int]]:
+        """Split file into byte ranges that start on the first line of a line group, so that no
+        group straddles two ranges.
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return [(0, None)]
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                content = np.frombuffer(buffer, dtype=np.uint8)
+                newlines = np.flatnonzero(content == ord("\n"))
+                line_starts = np.concatenate(([0], newlines + 1))
+                line_ends = np.append(newlines, size)
+                # Line endings are stripped as done by _read_lines (i.e. "\r" alone is an empty line)
+                has_cr = line_ends > line_starts
+                has_cr[has_cr] = content[line_ends[has_cr] - 1] == ord("\r")
+                line_ends = line_ends - has_cr
+                del content
+
+        if self.strip_empty_lines:
+            line_starts = line_starts[line_ends > line_starts]
+
+        group_starts = line_starts[:: max(1, self.line_group_size)]
+        n_chunks = max(1, min(n_chunks, len(group_starts)))
+        chunk_inds = np.linspace(0, len(group_starts), n_chunks, endpoint=False).astype(int)
+
+        boundaries = [0] + [int(group_starts[ind]) for ind in chunk_inds[1:]] + [None]
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def _cache_key(self, path: str) -> str:
+        return utils.cache.hash_bytes(
+            "FileParser",
+            utils.cache.hash_file(path),
+            utils.cache.hash_callable(self.data_parser),
+            # Parsed objects may be instances of utils classes
+            utils.cache.hash_package("utils"),
+            self.strip_empty_lines,
+            self.line_sep,
+            self.line_regex,
+            self.line_group_size,
+        )
 
     def parse_file(self, path: str) -> List[Any]:
         """Parse file using current configuration.
@@ -85,22 +463,18 @@ class FileParser:
         Returns:
             List[Any]: List of objects, obtained from parsing all aggregated/processed groups of lines in the input file
         """
-        with open(path) as f:
-            data = f.read()
-            data = data.split("\n")
-
-            if self.strip_empty_lines:
-                data = [d for d in data if d]
-
-            if self.line_sep is not None:
-                data = [line.split(self.line_sep) for line in data]
-
-            if self.line_regex is not None:
-                data = [re.match(self.line_regex, line).groups() for line in data]
+        if self.use_cache:
+            return parse_cache.get_or_compute(self._cache_key(path), lambda: self._parse_file(path))
+        return self._parse_file(path)
 
-            group_size = self.line_group_size
-            if group_size > 1:
-                data = [data[i : i + group_size] for i in range(0, len(data), group_size)]
+    def _parse_file(self, path: str) -> List[Any]:
+        if self.workers <= 1:
+            return self._parse_lines(_read_lines(path))
 
-            data = [self.data_parser(d) for d in data]
-            return data
+        # A few chunks per worker to balance load between processes
+        chunk_ranges = self._chunk_ranges(path, n_chunks=4 * self.workers)
+        with multiprocessing.Pool(self.workers) as pool:
+            chunks = pool.starmap(
+                self._parse_chunk, [(path, start, end) for start, end in chunk_ranges]
+            )
+        return list(itertools.chain.from_iterable(chunks))
@@ -0,0 +1,43 @@
+import importlib
+import sys
+import types
+from typing import List
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy importing the actual module on first attribute access"""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+
+    def __load(self) -> types.ModuleType:
+        module = importlib.import_module(self.__name__)
+        # Later accesses are plain attribute lookups
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, name: str):
+        return getattr(self.__load(), name)
+
+    def __dir__(self) -> List[str]:
+        return dir(self.__load())
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Module (or submodule, e.g. "scipy.ndimage") which is only imported when one of its attributes is
+    first used. Returns the module itself if already imported.
+
+    e.g.
+        sympy = utils.lazy.lazy_import("sympy")
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def preload(module: types.ModuleType) -> None:
+    """Import the modules lazily imported by module (e.g. to warm up a process before timing it)"""
+    for value in list(vars(module).values()):
+        if isinstance(value, LazyModule):
+            # Loads actual module
+            dir(value)
@@ -1,20 +1,35 @@
 from __future__ import annotations
 
+import heapq
+import itertools
+import operator
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
 
-import numpy as np
+import utils.lazy
 
+np = utils.lazy.lazy_import("numpy")
 
-# Hashable
-@dataclass(frozen=True, eq=True, order=True)
+
+# Offsets (x, y) of horizontal and vertical neighbors
+NEIGHBOR_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+# Offsets (x, y) of neighbors, by connectivity
+CONNECTIVITY_OFFSETS = {
+    4: NEIGHBOR_OFFSETS,
+    8: NEIGHBOR_OFFSETS + ((-1, -1), (1, -1), (-1, 1), (1, 1)),
+}
+
+
+# Hashable. Slotted, as maps can have millions of positions
+@dataclass(frozen=True, eq=True, order=True, slots=True)
 class MapPosition:
     x: int = 0
     y: int = 0
 
-    def __post_init__(self):
-        # Trick to set member despite class being frozen
-        super().__setattr__("s_", np.s_[self.y, self.x])
+    @property
+    def s_(self) -> Tuple[int, int]:
+        # Index in map arrays (i.e. np.s_[y, x]), only built when used
+        return (self.y, self.x)
 
     def __add__(self, other) -> MapPosition:
         if isinstance(other, MapPosition):
@@ -32,17 +47,14 @@ class MapPosition:
         return MapExtent([self])
 
     def neighbors(self, map_extent: MapExtent) -> List[MapPosition]:
-        neighbors = [
-            self + delta
-            for delta in [
-                MapPosition(-1, 0),
-                MapPosition(1, 0),
-                MapPosition(0, -1),
-                MapPosition(0, 1),
-            ]
+        x, y = self.x, self.y
+        x_min, y_min = map_extent.top_left.x, map_extent.top_left.y
+        x_max, y_max = map_extent.bottom_right.x, map_extent.bottom_right.y
+        return [
+            MapPosition(x + dx, y + dy)
+            for dx, dy in NEIGHBOR_OFFSETS
+            if x_min <= x + dx <= x_max and y_min <= y + dy <= y_max
         ]
-        neighbors = [n for n in neighbors if map_extent.contains(n)]
-        return neighbors
 
 
 # TODO: Cleanup: Turned out into a pretty useless class.
@@ -83,27 +95,32 @@ class MapExtent:
     def __post_init__(self):
         positions = [p for p in self._positions if p is not None]
         if positions:
-            sorted_x = sorted([p.x for p in positions])
-            sorted_y = sorted([p.y for p in positions])
-            super().__setattr__("top_left", MapPosition(x=sorted_x[0], y=sorted_y[0]))
-            super().__setattr__("bottom_right", MapPosition(x=sorted_x[-1], y=sorted_y[-1]))
-            super().__setattr__(
-                "s_", np.s_[sorted_y[0] : sorted_y[-1] + 1, sorted_x[0] : sorted_x[-1] + 1]
-            )
+            x_min = min(p.x for p in positions)
+            x_max = max(p.x for p in positions)
+            y_min = min(p.y for p in positions)
+            y_max = max(p.y for p in positions)
+            super().__setattr__("top_left", MapPosition(x=x_min, y=y_min))
+            super().__setattr__("bottom_right", MapPosition(x=x_max, y=y_max))
+            # Same as np.s_[y_min : y_max + 1, x_min : x_max + 1]
+            super().__setattr__("s_", (slice(y_min, y_max + 1), slice(x_min, x_max + 1)))
+            super().__setattr__("_width", x_max - x_min + 1)
+            super().__setattr__("_height", y_max - y_min + 1)
         else:
             super().__setattr__("top_left", None)
             super().__setattr__("bottom_right", None)
-            super().__setattr__("s_", np.s_[0:0, 0:0])
+            super().__setattr__("s_", (slice(0, 0), slice(0, 0)))
+            super().__setattr__("_width", None)
+            super().__setattr__("_height", None)
 
     @classmethod
     def from_shape(cls, shape: Tuple[int, int]) -> MapExtent:
         return cls([MapPosition(0, 0), MapPosition(shape[1] - 1, shape[0] - 1)])
 
     def width(self) -> int:
-        return self.bottom_right.x - self.top_left.x + 1
+        return self._width
 
     def height(self) -> int:
-        return self.bottom_right.y - self.top_left.y + 1
+        return self._height
 
     def __add__(self, other) -> MapExtent:
         if isinstance(other, MapPosition):
@@ -141,6 +158,14 @@ class MapExtent:
             )
         elif isinstance(other, MapStructure):
             return self.contains(other.extent())
+        elif isinstance(other, PositionArray):
+            # One bool per position
+            return (
+                (other.x >= self.top_left.x)
+                & (other.x <= self.bottom_right.x)
+                & (other.y >= self.top_left.y)
+                & (other.y <= self.bottom_right.y)
+            )
         else:
             return NotImplementedError()
 
@@ -168,4 +193,599 @@ class MapStructure:
     lines: List[MapLine] = field(default_factory=list)
 
     def extent(self) -> MapExtent:
-        return sum(self.lines, MapExtent())
+        # Single extent of all corners, rather than a sum of extents (each creating a new one)
+        return MapExtent(
+            [corner for line in self.lines for corner in (line.top_left, line.bottom_right)]
+        )
+
+
+######################################
+# Bulk drawing of structures
+######################################
+def segments_array(structures: Iterable[MapStructure]) -> np.ndarray:
+    """Lines of all structures as a (K, 4) int array of (x_min, y_min, x_max, y_max) rows"""
+    segments = [
+        (line.top_left.x, line.top_left.y, line.bottom_right.x, line.bottom_right.y)
+        for structure in structures
+        for line in structure.lines
+    ]
+    return np.array(segments, dtype=np.int64).reshape(-1, 4)
+
+
+def segments_extent(segments: np.ndarray) -> MapExtent:
+    """Extent of all segments of a (K, 4) array (see segments_array)"""
+    if not len(segments):
+        return MapExtent()
+    x_min, y_min = segments[:, :2].min(axis=0).tolist()
+    x_max, y_max = segments[:, 2:].max(axis=0).tolist()
+    return MapExtent([MapPosition(x_min, y_min), MapPosition(x_max, y_max)])
+
+
+def rasterize_segments(
+    segments: np.ndarray, target: np.ndarray, value, origin: MapPosition = MapPosition()
+) -> None:
+    """Set all cells of horizontal and vertical segments (or single points) to value, all at once
+
+    Args:
+        segments (np.ndarray): (K, 4) array of (x_min, y_min, x_max, y_max) rows (see segments_array)
+        target (np.ndarray): Map array, indexed by [y, x]
+        value: Value of segment cells
+        origin (MapPosition, optional): Position of target[0, 0]. Defaults to MapPosition() (0, 0).
+    """
+    if not len(segments):
+        return
+    x_min, y_min, x_max, y_max = segments.T
+    if np.any((x_min != x_max) & (y_min != y_max)):
+        raise ValueError("Segments must be horizontal or vertical")
+
+    # Cell k of a segment is its start plus k steps along its direction
+    lengths = (x_max - x_min) + (y_max - y_min) + 1
+    first_cells = np.cumsum(lengths) - lengths
+    steps = np.arange(lengths.sum()) - np.repeat(first_cells, lengths)
+    x = np.repeat(x_min, lengths) + steps * np.repeat(x_max > x_min, lengths)
+    y = np.repeat(y_min, lengths) + steps * np.repeat(y_max > y_min, lengths)
+    target[y - origin.y, x - origin.x] = value
+
+
+class PositionArray:
+    """Positions stored as an (N, 2) int array of (x, y) rows, for processing many positions at once with numpy
+    instead of creating a MapPosition for each of them.
+    """
+
+    def __init__(self, xy: Union[np.ndarray, Iterable[Tuple[int, int]]] = ()) -> None:
+        """
+        Args:
+            xy (Union[np.ndarray, Iterable[Tuple[int, int]]], optional): (x, y) of each position. Defaults to () (no
+                position).
+        """
+        self.xy: np.ndarray = np.asarray(xy, dtype=np.int64).reshape(-1, 2)
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[MapPosition]) -> PositionArray:
+        return cls([(p.x, p.y) for p in positions])
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> PositionArray:
+        """Positions of True values of a 2D array, in row-major order"""
+        # argwhere gives (row, column), i.e. (y, x)
+        return cls(np.argwhere(mask)[:, ::-1])
+
+    @classmethod
+    def from_shape(cls, shape: Tuple[int, int]) -> PositionArray:
+        """All positions of a map of given shape, in row-major order (i.e. position i has flat index i)"""
+        return cls.from_flat_indices(np.arange(shape[0] * shape[1]), shape)
+
+    @classmethod
+    def from_flat_indices(cls, indices: np.ndarray, shape: Tuple[int, int]) -> PositionArray:
+        y, x = np.unravel_index(indices, shape)
+        return cls(np.column_stack((x, y)))
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.xy[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.xy[:, 1]
+
+    @property
+    def s_(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Index of positions in a map array, e.g. values = map[positions.s_]"""
+        return (self.y, self.x)
+
+    def __len__(self) -> int:
+        return len(self.xy)
+
+    def __getitem__(self, key) -> Union[MapPosition, PositionArray]:
+        """Position at an index, or positions selected by a slice, index array or bool mask"""
+        if isinstance(key, (int, np.integer)):
+            return MapPosition(int(self.xy[key, 0]), int(self.xy[key, 1]))
+        return PositionArray(self.xy[key])
+
+    def __iter__(self) -> Iterator[MapPosition]:
+        return iter(self.to_positions())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PositionArray):
+            return np.array_equal(self.xy, other.xy)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PositionArray({self.xy.tolist()})"
+
+    def to_positions(self) -> List[MapPosition]:
+        return [MapPosition(x, y) for x, y in self.xy.tolist()]
+
+    @staticmethod
+    def __offsets(other) -> np.ndarray:
+        if isinstance(other, PositionArray):
+            return other.xy
+        if isinstance(other, MapPosition):
+            return np.array([other.x, other.y])
+        raise NotImplementedError()
+
+    def __add__(self, other) -> PositionArray:
+        return PositionArray(self.xy + self.__offsets(other))
+
+    def __sub__(self, other) -> PositionArray:
+        return PositionArray(self.xy - self.__offsets(other))
+
+    def extent(self) -> MapExtent:
+        if not len(self):
+            return MapExtent()
+        x_min, y_min = self.xy.min(axis=0).tolist()
+        x_max, y_max = self.xy.max(axis=0).tolist()
+        return MapExtent([MapPosition(x_min, y_min), MapPosition(x_max, y_max)])
+
+    def neighbors(self, map_extent: MapExtent = None) -> Tuple[np.ndarray, PositionArray]:
+        """Horizontal and vertical neighbors of all positions, grouped by direction (same order as MapPosition.neighbors)
+
+        Args:
+            map_extent (MapExtent, optional): Neighbors outside of it are dropped. Defaults to None (all kept).
+
+        Returns:
+            Tuple[np.ndarray, PositionArray]: Index of the position of each neighbor, and the neighbors
+        """
+        offsets = np.array(NEIGHBOR_OFFSETS, dtype=np.int64)
+        # (direction, position, coordinate) --> one row per neighbor
+        neighbors = PositionArray((self.xy[np.newaxis, :, :] + offsets[:, np.newaxis, :]))
+        sources = np.tile(np.arange(len(self)), len(offsets))
+        if map_extent is not None:
+            inside = map_extent.contains(neighbors)
+            sources, neighbors = sources[inside], neighbors[inside]
+        return sources, neighbors
+
+    def manhattan_distances(self, other: Union[MapPosition, PositionArray]) -> np.ndarray:
+        """Distance of each position to a position, or to the position of same index of another array"""
+        return np.abs(self.xy - self.__offsets(other)).sum(axis=1)
+
+    def flat_indices(self, map_extent: MapExtent) -> np.ndarray:
+        """Index of each position in the flattened (row-major) array covering map_extent. Positions must be in it."""
+        return np.ravel_multi_index(
+            (self.y - map_extent.top_left.y, self.x - map_extent.top_left.x),
+            (map_extent.height(), map_extent.width()),
+        )
+
+
+# Vectorized predicate/cost of moves: (source values, neighbor values) --> one bool/cost per move
+# (quoted so that numpy is only imported when used)
+MoveFunction = Callable[["np.ndarray", "np.ndarray"], "np.ndarray"]
+# Cells given as flat index, MapPosition, several of them, or PositionArray
+Cells = Union[int, MapPosition, Iterable[Union[int, MapPosition]], "np.ndarray", PositionArray]
+
+
+@dataclass
+class GridMove:
+    # Difference of flat indices between source and neighbor
+    offset: int
+    # Whether move is possible from each cell
+    allowed: np.ndarray
+    # Cost of move from each cell (None: cost 1)
+    cost: np.ndarray = None
+
+    def reversed(self) -> GridMove:
+        """Move in the opposite direction, allowed from the cells this move leads to"""
+        sources = np.flatnonzero(self.allowed)
+        allowed = np.zeros_like(self.allowed)
+        allowed[sources + self.offset] = True
+        cost = None
+        if self.cost is not None:
+            cost = np.zeros_like(self.cost)
+            cost[sources + self.offset] = self.cost[sources]
+        return GridMove(-self.offset, allowed, cost)
+
+
+class Grid:
+    """2D array searched along moves between its cells. Moves possible from each cell (and their costs) are
+    computed for all cells at once when the grid is created, and searches work on flat (row-major) indices, so
+    that maps with millions of cells are searched in seconds.
+
+    e.g. distances (number of moves) from start, climbing at most 1 per move:
+        grid = Grid(heights, can_move=lambda h, h_neighbor: h_neighbor - h <= 1)
+        distances = grid.bfs(start)
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        connectivity: Union[int, Sequence[Tuple[int, int]]] = 4,
+        can_move: MoveFunction = None,
+        move_cost: MoveFunction = None,
+    ) -> None:
+        """
+        Args:
+            values (np.ndarray): 2D array of cell values
+            connectivity (Union[int, Sequence[Tuple[int, int]]], optional): 4 (horizontal and vertical neighbors),
+                8 (also diagonal ones), or offsets (x, y) of neighbors. Defaults to 4.
+            can_move (MoveFunction, optional): Whether moves are possible. Defaults to None (all moves within grid).
+            move_cost (MoveFunction, optional): Cost of moves, used by dijkstra and astar (must be positive).
+                Defaults to None (cost 1).
+        """
+        self.values = values
+        self.shape: Tuple[int, int] = values.shape
+        self.offsets = tuple(
+            CONNECTIVITY_OFFSETS[connectivity] if isinstance(connectivity, int) else connectivity
+        )
+
+        height, width = self.shape
+        flat_values = values.ravel()
+        y, x = np.divmod(np.arange(flat_values.size), width)
+        self.moves: List[GridMove] = []
+        for dx, dy in self.offsets:
+            allowed = (x + dx >= 0) & (x + dx < width) & (y + dy >= 0) & (y + dy < height)
+            offset = dy * width + dx
+            sources = np.flatnonzero(allowed)
+            if can_move is not None:
+                allowed[sources] = can_move(flat_values[sources], flat_values[sources + offset])
+            cost = None
+            if move_cost is not None:
+                cost = np.zeros(flat_values.size)
+                cost[sources] = move_cost(flat_values[sources], flat_values[sources + offset])
+            self.moves.append(GridMove(offset, allowed, cost))
+
+        self.__reversed_moves: List[GridMove] = None
+        # Adjacency lists (as python lists, for heap based searches), by search direction
+        self.__adjacency = {}
+
+    @property
+    def size(self) -> int:
+        return self.shape[0] * self.shape[1]
+
+    def index(self, position: MapPosition) -> int:
+        return position.y * self.shape[1] + position.x
+
+    def position(self, index: int) -> MapPosition:
+        y, x = divmod(int(index), self.shape[1])
+        return MapPosition(x, y)
+
+    def indices(self, cells: Cells) -> np.ndarray:
+        """Flat indices of cells"""
+        if isinstance(cells, PositionArray):
+            return cells.flat_indices(MapExtent.from_shape(self.shape))
+        if isinstance(cells, (int, np.integer, MapPosition)):
+            cells = [cells]
+        return np.array(
+            [self.index(c) if isinstance(c, MapPosition) else c for c in cells], dtype=np.int64
+        )
+
+    def _moves(self, reverse: bool) -> List[GridMove]:
+        if not reverse:
+            return self.moves
+        if self.__reversed_moves is None:
+            self.__reversed_moves = [move.reversed() for move in self.moves]
+        return self.__reversed_moves
+
+    def bfs(self, sources: Cells, reverse: bool = False) -> np.ndarray:
+        """Number of moves from the nearest source to each cell. The search expands all cells at the same distance
+        at once.
+
+        Args:
+            sources (Cells): Source cells (several for a multi-source search)
+            reverse (bool, optional): Follow moves backwards, i.e. compute the number of moves from each cell to
+                the nearest source. Defaults to False.
+
+        Returns:
+            np.ndarray: Distances, with the shape of the grid (-1 for unreachable cells)
+        """
+        distances = np.full(self.size, -1, dtype=np.int64)
+        frontier = np.unique(self.indices(sources))
+        distances[frontier] = 0
+        moves = self._moves(reverse)
+
+        distance = 0
+        while frontier.size:
+            distance += 1
+            reached = []
+            for move in moves:
+                cells = frontier[move.allowed[frontier]] + move.offset
+                cells = cells[distances[cells] < 0]
+                distances[cells] = distance
+                reached.append(cells)
+            # Each direction reaches distinct cells, and cells already reached are filtered out
+            frontier = np.concatenate(reached)
+        return distances.reshape(self.shape)
+
+    def __adjacency_lists(self, reverse: bool) -> Tuple[List[int], List[int], List[float]]:
+        """Neighbors of cell i are targets[start[i] : start[i + 1]], with move costs costs[start[i] : start[i + 1]]"""
+        if reverse not in self.__adjacency:
+            sources, targets, costs = [], [], []
+            for move in self._moves(reverse):
+                move_sources = np.flatnonzero(move.allowed)
+                sources.append(move_sources)
+                targets.append(move_sources + move.offset)
+                costs.append(
+                    np.ones(move_sources.size) if move.cost is None else move.cost[move_sources]
+                )
+            sources = np.concatenate(sources)
+            order = np.argsort(sources, kind="stable")
+            start = np.concatenate(([0], np.cumsum(np.bincount(sources, minlength=self.size))))
+            self.__adjacency[reverse] = (
+                start.tolist(),
+                np.concatenate(targets)[order].tolist(),
+                np.concatenate(costs)[order].tolist(),
+            )
+        return self.__adjacency[reverse]
+
+    def dijkstra(self, sources: Cells, reverse: bool = False) -> np.ndarray:
+        """Cost of the cheapest path from the nearest source to each cell
+
+        Args:
+            sources (Cells): Source cells
+            reverse (bool, optional): Follow moves backwards (see bfs). Defaults to False.
+
+        Returns:
+            np.ndarray: Costs, with the shape of the grid (inf for unreachable cells)
+        """
+        start, targets, costs = self.__adjacency_lists(reverse)
+        distances = [float("inf")] * self.size
+        heap = [(0.0, cell) for cell in self.indices(sources).tolist()]
+        for __, cell in heap:
+            distances[cell] = 0.0
+        heapq.heapify(heap)
+
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if distance > distances[cell]:
+                continue
+            for k in range(start[cell], start[cell + 1]):
+                neighbor = targets[k]
+                neighbor_distance = distance + costs[k]
+                if neighbor_distance < distances[neighbor]:
+                    distances[neighbor] = neighbor_distance
+                    heapq.heappush(heap, (neighbor_distance, neighbor))
+        return np.array(distances).reshape(self.shape)
+
+    def astar(
+        self,
+        source: Union[int, MapPosition],
+        target: Union[int, MapPosition],
+        heuristic: Callable[[int], float] = None,
+        reverse: bool = False,
+    ) -> float:
+        """Cost of the cheapest path from source to target
+
+        Args:
+            source (Union[int, MapPosition]): Source cell
+            target (Union[int, MapPosition]): Target cell
+            heuristic (Callable[[int], float], optional): Lower bound of the cost from a cell (flat index) to target.
+                Defaults to None (Manhattan distance for 4-connectivity, otherwise Chebyshev distance over the
+                largest move, times the lowest move cost).
+            reverse (bool, optional): Follow moves backwards (see bfs). Defaults to False.
+
+        Returns:
+            float: Cost (inf if target cannot be reached)
+        """
+        start, targets, costs = self.__adjacency_lists(reverse)
+        source, target = self.indices([source, target]).tolist()
+        if heuristic is None:
+            heuristic = self.__default_heuristic(target, min(costs, default=1.0))
+
+        distances = {source: 0.0}
+        heap = [(heuristic(source), 0.0, source)]
+        while heap:
+            __, distance, cell = heapq.heappop(heap)
+            if cell == target:
+                return distance
+            if distance > distances[cell]:
+                continue
+            for k in range(start[cell], start[cell + 1]):
+                neighbor = targets[k]
+                neighbor_distance = distance + costs[k]
+                if neighbor_distance < distances.get(neighbor, float("inf")):
+                    distances[neighbor] = neighbor_distance
+                    heapq.heappush(
+                        heap, (neighbor_distance + heuristic(neighbor), neighbor_distance, neighbor)
+                    )
+        return float("inf")
+
+    def __default_heuristic(self, target: int, min_cost: float) -> Callable[[int], float]:
+        width = self.shape[1]
+        target_y, target_x = divmod(target, width)
+        if set(self.offsets) == set(NEIGHBOR_OFFSETS):
+            return lambda cell: min_cost * (
+                abs(cell // width - target_y) + abs(cell % width - target_x)
+            )
+
+        max_step = max(max(abs(dx), abs(dy)) for dx, dy in self.offsets)
+        return lambda cell: (
+            min_cost * max(abs(cell // width - target_y), abs(cell % width - target_x)) / max_step
+        )
+
+
+class TileMap:
+    """Unbounded array of any dimension (e.g. a map with far-apart structures, coordinates in the millions or
+    negative ones), stored as fixed-size numpy tiles allocated when first written to. Memory is then proportional to
+    the area actually used. Indexed like a numpy array with coordinates, regions needing explicit bounds, e.g.
+        tile_map[y, x] = 1
+        tile_map[-10:10, 5:8] = values
+    """
+
+    def __init__(
+        self, tile_shape: Tuple[int, ...] = (64, 64), dtype: type = "uint8", fill_value=0
+    ) -> None:
+        """
+        Args:
+            tile_shape (Tuple[int, ...], optional): Shape of tiles, which gives the number of dimensions.
+                Defaults to (64, 64).
+            dtype (type, optional): Type of values. Defaults to "uint8".
+            fill_value (optional): Value of cells never written to. Defaults to 0.
+        """
+        self.tile_shape = tuple(tile_shape)
+        self.dtype = np.dtype(dtype)
+        self.fill_value = fill_value
+        # Tile coordinates (i.e. coordinates of its first cell // tile_shape) --> tile
+        self.tiles: Dict[Tuple[int, ...], np.ndarray] = {}
+
+    @property
+    def ndim(self) -> int:
+        return len(self.tile_shape)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(tile.nbytes for tile in self.tiles.values())
+
+    def __tile(self, key: Tuple[int, ...], create: bool) -> np.ndarray:
+        tile = self.tiles.get(key)
+        if tile is None and create:
+            tile = self.tiles[key] = np.full(self.tile_shape, self.fill_value, dtype=self.dtype)
+        return tile
+
+    def __region(self, key) -> Tuple[List[int], List[int], Tuple[int, ...]]:
+        """Start and stop coordinates of region indexed by key, and axes indexed by an integer (dropped from the
+        region's array)
+        """
+        key = key if isinstance(key, tuple) else (key,)
+        if len(key) != self.ndim:
+            raise IndexError(
+                f"TileMap of dimension {self.ndim} indexed with {len(key)} coordinates"
+            )
+        starts, stops, int_axes = [], [], []
+        for axis, k in enumerate(key):
+            if isinstance(k, slice):
+                if k.start is None or k.stop is None or k.step not in (None, 1):
+                    raise IndexError("TileMap regions need explicit bounds and no step")
+                starts.append(k.start)
+                stops.append(max(k.start, k.stop))
+            else:
+                starts.append(int(k))
+                stops.append(int(k) + 1)
+                int_axes.append(axis)
+        return starts, stops, tuple(int_axes)
+
+    def __overlapping_tiles(
+        self, starts: List[int], stops: List[int]
+    ) -> Iterator[Tuple[Tuple[int, ...], Tuple[slice, ...], Tuple[slice, ...]]]:
+        """Keys of tiles overlapping region, with index of overlap in tile and in region array"""
+        tile_ranges = [
+            range(start // size, -(-stop // size))
+            for start, stop, size in zip(starts, stops, self.tile_shape)
+        ]
+        for key in itertools.product(*tile_ranges):
+            tile_index, region_index = [], []
+            for k, start, stop, size in zip(key, starts, stops, self.tile_shape):
+                low, high = max(start, k * size), min(stop, (k + 1) * size)
+                tile_index.append(slice(low - k * size, high - k * size))
+                region_index.append(slice(low - start, high - start))
+            yield key, tuple(tile_index), tuple(region_index)
+
+    def __cell(self, key) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Key of tile containing cell, and index of cell in tile. None if key is not a cell."""
+        if not isinstance(key, tuple) or len(key) != self.ndim:
+            return None
+        try:
+            return (
+                tuple(map(operator.floordiv, key, self.tile_shape)),
+                tuple(map(operator.mod, key, self.tile_shape)),
+            )
+        except TypeError:
+            # Region (slices)
+            return None
+
+    def __getitem__(self, key):
+        cell = self.__cell(key)
+        if cell is not None:
+            tile = self.tiles.get(cell[0])
+            return self.dtype.type(self.fill_value) if tile is None else tile[cell[1]]
+
+        starts, stops, int_axes = self.__region(key)
+        region = np.full(
+            [stop - start for start, stop in zip(starts, stops)], self.fill_value, dtype=self.dtype
+        )
+        for tile_key, tile_index, region_index in self.__overlapping_tiles(starts, stops):
+            tile = self.tiles.get(tile_key)
+            if tile is not None:
+                region[region_index] = tile[tile_index]
+        return region.squeeze(axis=int_axes) if int_axes else region
+
+    def __setitem__(self, key, value) -> None:
+        cell = self.__cell(key)
+        if cell is not None:
+            self.__tile(cell[0], create=True)[cell[1]] = value
+            return
+
+        starts, stops, int_axes = self.__region(key)
+        shape = [stop - start for start, stop in zip(starts, stops)]
+        value = np.asarray(value, dtype=self.dtype)
+        if int_axes and value.ndim > 0:
+            value = np.expand_dims(value, int_axes)
+        value = np.broadcast_to(value, shape)
+        for tile_key, tile_index, region_index in self.__overlapping_tiles(starts, stops):
+            self.__tile(tile_key, create=True)[tile_index] = value[region_index]
+
+    def get(self, coordinates: np.ndarray) -> np.ndarray:
+        """Values at many coordinates at once
+
+        Args:
+            coordinates (np.ndarray): (N, ndim) int array
+
+        Returns:
+            np.ndarray: N values
+        """
+        coordinates = np.asarray(coordinates, dtype=np.int64).reshape(-1, self.ndim)
+        values = np.full(len(coordinates), self.fill_value, dtype=self.dtype)
+        for tile_key, selected, inner in self.__group_by_tile(coordinates):
+            tile = self.tiles.get(tile_key)
+            if tile is not None:
+                values[selected] = tile[inner]
+        return values
+
+    def set(self, coordinates: np.ndarray, values) -> None:
+        """Set values at many coordinates at once
+
+        Args:
+            coordinates (np.ndarray): (N, ndim) int array
+            values: N values, or a single one
+        """
+        coordinates = np.asarray(coordinates, dtype=np.int64).reshape(-1, self.ndim)
+        values = np.broadcast_to(np.asarray(values, dtype=self.dtype), len(coordinates))
+        for tile_key, selected, inner in self.__group_by_tile(coordinates):
+            self.__tile(tile_key, create=True)[inner] = values[selected]
+
+    def __group_by_tile(
+        self, coordinates: np.ndarray
+    ) -> Iterator[Tuple[Tuple[int, ...], np.ndarray, Tuple[np.ndarray, ...]]]:
+        """Coordinates grouped by tile: tile key, indices of its coordinates, and their index in tile"""
+        tile_shape = np.array(self.tile_shape)
+        tile_keys, inner = np.divmod(coordinates, tile_shape)
+        unique_keys, groups = np.unique(tile_keys, axis=0, return_inverse=True)
+        # Stable, so that coordinates of a tile keep their order (last value set wins)
+        order = np.argsort(groups.reshape(-1), kind="stable")
+        __, starts = np.unique(groups.reshape(-1)[order], return_index=True)
+        for tile_key, selected in zip(unique_keys.tolist(), np.split(order, starts[1:])):
+            yield tuple(tile_key), selected, tuple(inner[selected].T)
+
+    def bounds(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Start (included) and stop (excluded) coordinates of region covered by allocated tiles"""
+        if not self.tiles:
+            return (0,) * self.ndim, (0,) * self.ndim
+        keys = np.array(list(self.tiles))
+        tile_shape = np.array(self.tile_shape)
+        return (
+            tuple((keys.min(axis=0) * tile_shape).tolist()),
+            tuple(((keys.max(axis=0) + 1) * tile_shape).tolist()),
+        )
+
+    def to_dense(self) -> Tuple[np.ndarray, Tuple[int, ...]]:
+        """Dense array of region covered by allocated tiles, and coordinates of its first cell"""
+        starts, stops = self.bounds()
+        return self[tuple(slice(start, stop) for start, stop in zip(starts, stops))], starts
@@ -0,0 +1,155 @@
+import cProfile
+import os
+import pstats
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, Set, Tuple, Union
+
+import utils.env
+
+# Enables profiling of timed functions and tested solvers: "1"/"all" for all days, or comma-separated days
+# (e.g. "13,17")
+PROFILE_ENV = "AOC_PROFILE"
+# Directory where profiles are written
+PROFILE_DIR_ENV = "AOC_PROFILE_DIR"
+DEFAULT_PROFILE_DIR = os.path.join("output", "profiles")
+
+# pstats function key: (file name, line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+
+def _function_name(func: FunctionKey) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # Built-in
+        return name
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+def collapsed_stacks(stats: pstats.Stats, min_time: float = 1e-6) -> Dict[str, float]:
+    """Convert profile statistics to collapsed stacks (i.e. "root;caller;function" --> self time in seconds).
+    cProfile only records caller/callee pairs, so the time of a function called from several places is split
+    between its call paths in proportion to the time spent in each caller/callee pair.
+
+    Args:
+        stats (pstats.Stats): Profile statistics
+        min_time (float, optional): Call paths with less time than this are pruned. Defaults to 1e-6.
+
+    Returns:
+        Dict[str, float]: Self time of each call path
+    """
+    entries = stats.stats
+    # Time spent in callee when called from caller
+    callees: Dict[FunctionKey, Dict[FunctionKey, float]] = defaultdict(dict)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, caller_cumulative_time) in callers.items():
+            callees[caller][func] = caller_cumulative_time
+
+    stacks: Dict[str, float] = defaultdict(float)
+
+    def _walk(func: FunctionKey, path: Tuple[str, ...], on_path: Set[FunctionKey], time: float):
+        _, _, self_time, cumulative_time, _ = entries[func]
+        fraction = time / cumulative_time if cumulative_time > 0 else 0
+        path = path + (_function_name(func),)
+        stacks[";".join(path)] += self_time * fraction
+
+        for callee, callee_time in callees[func].items():
+            callee_time *= fraction
+            # Recursive calls are already accounted for by the outermost call
+            if callee not in on_path and callee_time >= min_time:
+                _walk(callee, path, on_path | {callee}, callee_time)
+
+    for func, (_, _, _, cumulative_time, callers) in entries.items():
+        if not callers:
+            _walk(func, (), {func}, cumulative_time)
+
+    return {stack: time for stack, time in stacks.items() if time >= min_time}
+
+
+class Profiler:
+    """Profiles code blocks with cProfile, writing a .pstats file and a .collapsed file (collapsed stacks in
+    microseconds, as used by flame graph tools) for each profiled call.
+    """
+
+    def __init__(self, days: Union[bool, Set[int]] = False, directory: str = None) -> None:
+        """
+        Args:
+            days (Union[bool, Set[int]], optional): Days for which timed functions and tested solvers are profiled
+                (True for all). Defaults to False.
+            directory (str, optional): Output directory. Defaults to None ($AOC_PROFILE_DIR or output/profiles).
+        """
+        self.days = days
+        self.directory = directory or os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+        self.enabled = bool(days)
+        self.__local = threading.local()
+        self.__n_calls: Dict[str, int] = defaultdict(int)
+
+    def profiles(self, module: str) -> bool:
+        """Whether functions of given module should be profiled"""
+        return utils.env.is_enabled_for(self.days, module)
+
+    @contextmanager
+    def profile(self, label: str) -> Iterator[None]:
+        """Profile body of context. Only one profiler can be active at a time, so nested profiles are ignored
+        (their calls are part of the outer profile).
+
+        Args:
+            label (str): Name of output files (followed by call index, as the same code can be profiled many times)
+        """
+        if getattr(self.__local, "active", False):
+            yield
+            return
+
+        profile = cProfile.Profile()
+        self.__local.active = True
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.__local.active = False
+            self.dump(profile, label)
+
+    def dump(self, profile: cProfile.Profile, label: str) -> str:
+        """Write profile files
+
+        Args:
+            profile (cProfile.Profile): Profile to write
+            label (str): Name of output files
+
+        Returns:
+            str: Output file path, without extension
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{label}-{self.__n_calls[label]}")
+        self.__n_calls[label] += 1
+
+        profile.dump_stats(f"{path}.pstats")
+        stacks = collapsed_stacks(pstats.Stats(profile))
+        with open(f"{path}.collapsed", "w") as f:
+            for stack, time in stacks.items():
+                f.write(f"{stack} {round(time * 1e6)}\n")
+        return path
+
+    def wrap(self, f: Callable, label: str = None) -> Callable:
+        """Profile calls to f if enabled for its module"""
+        label = label or f"{f.__module__}.{f.__qualname__}"
+
+        @wraps(f)
+        def wrap(*args, **kw):
+            if not self.profiles(f.__module__):
+                return f(*args, **kw)
+            with self.profile(label):
+                return f(*args, **kw)
+
+        return wrap
+
+
+profiler = Profiler(days=utils.env.days(PROFILE_ENV))
+
+
+def profile(f: Callable) -> Callable:
+    """Function profiling decorator, for functions that are not already timed with utils.timing.timing"""
+    return profiler.wrap(f)
@@ -0,0 +1,136 @@
+"""Opt-in cache of solver answers, so that tests of days that did not change return at once.
+
+Answers are keyed by the sources of the day's package and of the utils modules it uses (directly or through other
+utils modules), the input file content, the part and the solver arguments: editing any of them invalidates them.
+"""
+
+import functools
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, List, Set, Tuple, Union
+
+import utils.cache
+import utils.env
+
+# Enables the result cache: "1"/"all" for all days, or comma-separated days (e.g. "11,15")
+RESULT_CACHE_ENV = "AOC_RESULT_CACHE"
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Directory containing the dayXX packages
+SRC_DIR = os.path.dirname(UTILS_DIR)
+
+# Uses of utils modules in a source (e.g. "utils.map", "utils.Session" or "from utils import io, map")
+_UTILS_REFERENCE_REGEX = re.compile(
+    r"\butils\.(\w+)|^\s*from utils import \(?([\w, ]+)", re.MULTILINE
+)
+
+
+def _referenced_utils_modules(path: str) -> Set[str]:
+    """Paths of the utils modules referenced in a source file. Attributes exported by utils (e.g. utils.Session)
+    are matched to their module case-insensitively.
+    """
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    names = set()
+    for attribute, imported in _UTILS_REFERENCE_REGEX.findall(source):
+        names.add(attribute)
+        names.update(name.strip() for name in imported.split(","))
+
+    paths = set()
+    for name in names:
+        module_path = os.path.join(UTILS_DIR, f"{name.lower()}.py")
+        if name and os.path.exists(module_path):
+            paths.add(module_path)
+    return paths
+
+
+def source_dependencies(day: int) -> List[str]:
+    """Source files an answer of day depends on: modules of the day's package (but its tests), and the utils
+    modules they use, transitively
+    """
+    day_dir = os.path.join(SRC_DIR, f"day{day:02d}")
+    day_paths = [
+        os.path.join(day_dir, name)
+        for name in os.listdir(day_dir)
+        if name.endswith(".py") and not name.startswith("test_")
+    ]
+
+    utils_paths = {os.path.join(UTILS_DIR, "__init__.py")}
+    to_scan = list(day_paths)
+    while to_scan:
+        for path in _referenced_utils_modules(to_scan.pop()) - utils_paths:
+            utils_paths.add(path)
+            to_scan.append(path)
+    return sorted(day_paths) + sorted(utils_paths)
+
+
+class ResultCache:
+    """Solver answers stored in a DiskCache, for enabled days"""
+
+    def __init__(
+        self, days: Union[bool, Set[int]] = False, max_size_bytes: int = 16 * 2**20
+    ) -> None:
+        """
+        Args:
+            days (Union[bool, Set[int]], optional): Days whose answers are cached (True for all). Defaults to False.
+            max_size_bytes (int, optional): Maximum size of stored answers. Defaults to 16 MB.
+        """
+        self.days = days
+        self.store = utils.cache.DiskCache("results", max_size_bytes=max_size_bytes)
+        # Hash of the sources of each day, computed once per process
+        self._source_hashes: Dict[int, str] = {}
+
+    def is_enabled(self, day: int) -> bool:
+        enabled = self.days if isinstance(self.days, bool) else day in self.days
+        return enabled and self.store.is_enabled()
+
+    def source_hash(self, day: int) -> str:
+        if day not in self._source_hashes:
+            paths = source_dependencies(day)
+            self._source_hashes[day] = utils.cache.hash_bytes(
+                *[(os.path.relpath(path, SRC_DIR), utils.cache.hash_file(path)) for path in paths],
+                sys.version_info[:2],
+            )
+        return self._source_hashes[day]
+
+    def key(self, day: int, part: int, input_file: str, solver_kwargs: Dict) -> str:
+        return utils.cache.hash_bytes(
+            "solve",
+            day,
+            part,
+            self.source_hash(day),
+            utils.cache.hash_file(input_file),
+            sorted(solver_kwargs.items()),
+        )
+
+    def get(self, day: int, part: int, input_file: str, solver_kwargs: Dict) -> Tuple[bool, Any]:
+        """Look up answer
+
+        Returns:
+            Tuple[bool, Any]: Whether the answer was found, and the answer (None if not found)
+        """
+        if not self.is_enabled(day):
+            return False, None
+        return self.store.get(self.key(day, part, input_file, solver_kwargs))
+
+    def put(self, day: int, part: int, input_file: str, solver_kwargs: Dict, answer: Any) -> None:
+        # A solver finding no answer may be unfinished
+        if self.is_enabled(day) and answer is not None:
+            self.store.put(self.key(day, part, input_file, solver_kwargs), answer)
+
+    def wrap(self, solver: Callable, day: int, part: int) -> Callable:
+        """solve_part_<N>(input_file, **solver_kwargs) function returning cached answers if enabled for day"""
+
+        @functools.wraps(solver)
+        def wrap(input_file: str, **solver_kwargs):
+            found, answer = self.get(day, part, input_file, solver_kwargs)
+            if not found:
+                answer = solver(input_file, **solver_kwargs)
+                self.put(day, part, input_file, solver_kwargs, answer)
+            return answer
+
+        return wrap
+
+
+result_cache = ResultCache(days=utils.env.days(RESULT_CACHE_ENV))
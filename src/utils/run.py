@@ -0,0 +1,269 @@
+"""Run solvers of several days and parts, one after another or in parallel, and print a summary table.
+
+Run from the repository root, e.g.
+    PYTHONPATH=src python -m utils.run                     # All days, real inputs
+    PYTHONPATH=src python -m utils.run 13 18 --example     # Some days, example inputs
+    PYTHONPATH=src python -m utils.run --workers 4 --timeout 60 --repeats 3
+
+Each solver runs in its own process, so that it can be stopped when it exceeds its timeout and so that its
+peak memory (maximum resident set size) can be measured. Solver arguments and expected answers are taken
+from the day's tests when available.
+"""
+
+import argparse
+import glob
+import importlib
+import multiprocessing
+import multiprocessing.connection
+import os
+import re
+import resource
+import statistics
+import sys
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Sequence, Tuple
+
+import utils.cache
+
+# Directory containing the dayXX packages
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def day_string(day: int) -> str:
+    return f"day{day:02d}"
+
+
+def find_days() -> List[int]:
+    """Days having a solution module"""
+    paths = glob.glob(os.path.join(SRC_DIR, "day*", "solution.py"))
+    days = [re.fullmatch(r"day(\d+)", os.path.basename(os.path.dirname(path))) for path in paths]
+    return sorted(int(m.group(1)) for m in days if m is not None)
+
+
+@dataclass
+class Job:
+    day: int
+    part: int
+    input_file: str
+    solver_kwargs: Dict = field(default_factory=dict)
+    # None if unknown
+    expected: Any = None
+
+
+@dataclass
+class JobResult:
+    job: Job
+    # "ok", "wrong" (answer differs from expected one), "error", "timeout" or "missing" (no input file)
+    status: str
+    answer: Any = None
+    # Duration of each run, in seconds
+    times: List[float] = field(default_factory=list)
+    # Maximum resident set size of the process running the solver, in bytes
+    peak_rss: int = None
+    error: str = None
+
+    def median_time(self) -> float:
+        return statistics.median(self.times) if self.times else None
+
+
+def _test_config(day: int, example: bool, part: int) -> Tuple[Dict, Any]:
+    """Solver arguments and expected answer configured in the day's tests (see utils.test)"""
+    try:
+        test_class = importlib.import_module(f"{day_string(day)}.test_solution").TestSolution
+    except (ImportError, AttributeError):
+        return {}, None
+    # Sets configuration as class members, as done by pytest
+    test_class.setup_class(test_class)
+    prefix = f"part_{part}_example" if example else f"part_{part}"
+    solver_kwargs = getattr(test_class, f"{prefix}_kwargs", {})
+    return solver_kwargs, getattr(test_class, f"{prefix}_result", None)
+
+
+def make_jobs(days: Sequence[int], parts: Sequence[int], example: bool = False) -> List[Job]:
+    jobs = []
+    input_dir = "example_input" if example else "input"
+    for day in days:
+        for part in parts:
+            solver_kwargs, expected = _test_config(day, example, part)
+            input_file = os.path.join(input_dir, f"{day_string(day)}.txt")
+            jobs.append(Job(day, part, input_file, solver_kwargs, expected))
+    return jobs
+
+
+def _peak_rss() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _run_job(job: Job, repeats: int, connection: multiprocessing.connection.Connection) -> None:
+    """Process target: run solver and send back (status, answer, times, peak RSS, error)"""
+    # Some solvers print a lot (e.g. day07 prints its tree), which is not part of their answer
+    sys.stdout = open(os.devnull, "w")
+    try:
+        solution = importlib.import_module(f"{day_string(job.day)}.solution")
+        solver = getattr(solution, f"solve_part_{job.part}")
+        times = []
+        for __ in range(repeats):
+            start = time.perf_counter()
+            answer = solver(job.input_file, **job.solver_kwargs)
+            times.append(time.perf_counter() - start)
+        status = "ok" if job.expected is None or answer == job.expected else "wrong"
+        connection.send((status, answer, times, _peak_rss(), None))
+    except Exception:
+        connection.send(("error", None, [], _peak_rss(), traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+def iter_jobs(
+    jobs: Sequence[Job], workers: int = 1, repeats: int = 1, timeout: float = None
+) -> Iterator[Tuple[int, JobResult]]:
+    """Run jobs, each in its own process, with at most workers processes at a time, yielding results as jobs end
+
+    Args:
+        jobs (Sequence[Job]): Jobs to run
+        workers (int, optional): Number of jobs running in parallel. Defaults to 1.
+        repeats (int, optional): Number of runs of each solver. Defaults to 1.
+        timeout (float, optional): Jobs still running after this time (in seconds, for all their runs) are
+            stopped. Defaults to None (no timeout).
+
+    Yields:
+        Iterator[Tuple[int, JobResult]]: Index of job in jobs, and its result
+    """
+    pending: Deque[int] = deque()
+    for ind, job in enumerate(jobs):
+        if os.path.exists(job.input_file):
+            pending.append(ind)
+        else:
+            yield ind, JobResult(job, "missing")
+
+    # Running jobs: receiving end of their pipe --> (job index, process, start time)
+    running: Dict[
+        multiprocessing.connection.Connection, Tuple[int, multiprocessing.Process, float]
+    ] = {}
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                ind = pending.popleft()
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                # Not a daemon, as some solvers use their own process pool
+                process = multiprocessing.Process(
+                    target=_run_job, args=(jobs[ind], repeats, sender)
+                )
+                process.start()
+                sender.close()
+                running[receiver] = (ind, process, time.perf_counter())
+
+            # Wake up at the next timeout, if any
+            wait_time = None
+            if timeout is not None:
+                next_end = min(start for _, _, start in running.values()) + timeout
+                wait_time = max(0.0, next_end - time.perf_counter())
+
+            for receiver in multiprocessing.connection.wait(list(running), timeout=wait_time):
+                ind, process, _ = running.pop(receiver)
+                try:
+                    status, answer, times, peak_rss, error = receiver.recv()
+                except EOFError:
+                    # Process died without sending its result (e.g. killed by OOM killer)
+                    status, answer, times, peak_rss, error = "error", None, [], None, "Process died"
+                receiver.close()
+                process.join()
+                yield ind, JobResult(jobs[ind], status, answer, times, peak_rss, error)
+
+            if timeout is not None:
+                now = time.perf_counter()
+                for receiver, (ind, process, start) in list(running.items()):
+                    if now - start >= timeout:
+                        process.kill()
+                        process.join()
+                        receiver.close()
+                        del running[receiver]
+                        yield ind, JobResult(jobs[ind], "timeout")
+    finally:
+        # Iteration stopped early
+        for receiver, (_, process, _) in running.items():
+            process.kill()
+            process.join()
+            receiver.close()
+
+
+def run_jobs(
+    jobs: Sequence[Job], workers: int = 1, repeats: int = 1, timeout: float = None
+) -> List[JobResult]:
+    """Run jobs (see iter_jobs)
+
+    Returns:
+        List[JobResult]: Results, in the order of jobs
+    """
+    results = dict(iter_jobs(jobs, workers=workers, repeats=repeats, timeout=timeout))
+    return [results[ind] for ind in range(len(jobs))]
+
+
+def _format_answer(answer: Any, max_length: int = 24) -> str:
+    # Multi-line answers (e.g. day10's display) are shown on one line
+    text = "|".join(answer) if isinstance(answer, list) else str(answer)
+    return text if len(text) <= max_length else text[: max_length - 3] + "..."
+
+
+def report(results: Sequence[JobResult]) -> str:
+    """Summary table of results"""
+    lines = [
+        f"{'day':>3} {'part':>4} {'status':>8} {'answer':<24} {'median s':>10} {'min s':>10}"
+        f" {'peak MB':>10}"
+    ]
+    for result in results:
+        times = result.times
+        median = f"{result.median_time():>10.4f}" if times else f"{'-':>10}"
+        minimum = f"{min(times):>10.4f}" if times else f"{'-':>10}"
+        peak = f"{result.peak_rss / 2**20:>10.1f}" if result.peak_rss else f"{'-':>10}"
+        answer = "" if result.status in ("missing", "timeout") else _format_answer(result.answer)
+        lines.append(
+            f"{result.job.day:>3} {result.job.part:>4} {result.status:>8} {answer:<24} {median}"
+            f" {minimum} {peak}"
+        )
+    return "\n".join(lines)
+
+
+def main(args: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run solvers and summarize answers, times and memory"
+    )
+    parser.add_argument("days", type=int, nargs="*", help="Days to run (default: all)")
+    parser.add_argument("--parts", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--example", action="store_true", help="Use example inputs")
+    parser.add_argument("--workers", type=int, default=1, help="Number of solvers run in parallel")
+    parser.add_argument("--repeats", type=int, default=1, help="Number of runs of each solver")
+    parser.add_argument("--timeout", type=float, help="Maximum time of each solver (s)")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Disable caches (e.g. parsed input)"
+    )
+    options = parser.parse_args(args)
+
+    if options.no_cache:
+        # Inherited by solver processes
+        os.environ[utils.cache.NO_CACHE_ENV] = "1"
+
+    jobs = make_jobs(options.days or find_days(), options.parts, example=options.example)
+    start = time.perf_counter()
+    results = run_jobs(
+        jobs, workers=options.workers, repeats=options.repeats, timeout=options.timeout
+    )
+    wall_time = time.perf_counter() - start
+
+    print(report(results))
+    print(f"{len(jobs)} solvers in {wall_time:.2f} s with {options.workers} worker(s)")
+    for result in results:
+        if result.error:
+            print(f"\nday {result.job.day} part {result.job.part}:\n{result.error}")
+
+    # Non-zero exit status if any solver failed
+    return int(any(result.status in ("wrong", "error", "timeout") for result in results))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Measure how solvers scale with input size, using synthetic inputs (see utils.generators).
+
+Run from the repository root, e.g.
+    PYTHONPATH=src python -m utils.scaling 20 21 --sizes 1000 2000 4000
+
+For each day, time and peak memory of each part are written to output/scaling/dayXX.json, and plotted
+against input size to output/scaling/dayXX.png if matplotlib is installed.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Sequence
+
+import utils.benchmark
+import utils.cache
+import utils.generators
+import utils.timing
+
+DEFAULT_SCALING_DIR = os.path.join("output", "scaling")
+
+
+@dataclass
+class ScalingPoint:
+    size: int
+    file_bytes: int
+    # Median duration in seconds
+    time: float
+    # Peak traced memory in bytes (None if not tracked)
+    peak_memory: int = None
+
+
+def measure(
+    solver: Callable,
+    input_file: str,
+    solver_kwargs: Dict,
+    repeats: int = 1,
+    track_memory: bool = True,
+) -> ScalingPoint:
+    """Time solver on input file, then run it once more to track its memory (as tracing slows it down)"""
+    # Solvers may print a lot (e.g. day07 prints its tree), which would dominate their time
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark = utils.benchmark.run_benchmark(
+            solver, input_file, solver_kwargs, repeats=repeats, warmup=0
+        )
+
+        peak_memory = None
+        if track_memory:
+            recorder = utils.timing.SpanRecorder(enabled=True, memory_days=True)
+            with recorder.span("solver", track_memory=True):
+                solver(input_file, **solver_kwargs)
+            peak_memory = recorder.memory[("solver",)].peak
+
+    return ScalingPoint(
+        size=0,
+        file_bytes=os.path.getsize(input_file),
+        time=benchmark.median(),
+        peak_memory=peak_memory,
+    )
+
+
+def run_scaling(
+    day: int,
+    parts: Sequence[int] = (1, 2),
+    sizes: Sequence[int] = None,
+    seed: int = 0,
+    repeats: int = 1,
+    track_memory: bool = True,
+    max_time: float = 60.0,
+) -> Dict[int, List[ScalingPoint]]:
+    """Run solvers of a day on synthetic inputs of increasing size
+
+    Args:
+        day (int): Day
+        parts (Sequence[int], optional): Parts to run. Defaults to (1, 2).
+        sizes (Sequence[int], optional): Input sizes. Defaults to None (generator default sizes).
+        seed (int, optional): Seed of generated inputs. Defaults to 0.
+        repeats (int, optional): Number of timed runs per size. Defaults to 1.
+        track_memory (bool, optional): Whether to also measure peak memory. Defaults to True.
+        max_time (float, optional): A part is not run on larger inputs once a run took longer than this
+            (in seconds). Defaults to 60.
+
+    Returns:
+        Dict[int, List[ScalingPoint]]: Measurements of each part, by increasing size
+    """
+    generator = utils.generators.get(day)
+    solution = importlib.import_module(f"day{day:02d}.solution")
+    sizes = sorted(sizes or generator.default_sizes)
+
+    results: Dict[int, List[ScalingPoint]] = {part: [] for part in parts}
+    for size in sizes:
+        input_file = generator.write(size, seed=seed)
+        for part in parts:
+            points = results[part]
+            if points and points[-1].time > max_time:
+                continue
+            solver = getattr(solution, f"solve_part_{part}")
+            point = measure(solver, input_file, generator.kwargs(part, size), repeats, track_memory)
+            point.size = size
+            points.append(point)
+            print(
+                f"day {day:2} part {part} size {size:>9}: {point.time:10.4f} s"
+                + ("" if point.peak_memory is None else f" {point.peak_memory / 2**20:10.2f} MB")
+            )
+    return results
+
+
+def plot(day: int, results: Dict[int, List[ScalingPoint]], path: str) -> bool:
+    """Plot time and memory against input size (log-log). Returns False if matplotlib is not installed."""
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return False
+
+    fig, (time_ax, memory_ax) = plt.subplots(1, 2, figsize=(12, 5))
+    for part, points in results.items():
+        sizes = [point.size for point in points]
+        time_ax.loglog(sizes, [point.time for point in points], "o-", label=f"part {part}")
+        memory = [point.peak_memory for point in points if point.peak_memory is not None]
+        if memory:
+            memory_ax.loglog(sizes, [m / 2**20 for m in memory], "o-", label=f"part {part}")
+
+    time_ax.set(title=f"Day {day} time", xlabel="input size", ylabel="time (s)")
+    memory_ax.set(title=f"Day {day} peak memory", xlabel="input size", ylabel="peak memory (MB)")
+    for ax in (time_ax, memory_ax):
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return True
+
+
+def main(args: Sequence[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure scaling of solvers on synthetic inputs")
+    parser.add_argument(
+        "days", type=int, nargs="*", help="Days to run (default: all days with a generator)"
+    )
+    parser.add_argument("--parts", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--sizes", type=int, nargs="+", help="Input sizes (default: per day)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=1, help="Timed runs per size")
+    parser.add_argument("--no-memory", action="store_true", help="Do not measure peak memory")
+    parser.add_argument(
+        "--max-time",
+        type=float,
+        default=60.0,
+        help="Stop growing the input of a part once a run takes longer than this (s)",
+    )
+    parser.add_argument("--output", default=DEFAULT_SCALING_DIR, help="Output directory")
+    options = parser.parse_args(args)
+
+    # Parsing is part of what is measured
+    os.environ[utils.cache.NO_CACHE_ENV] = "1"
+    os.makedirs(options.output, exist_ok=True)
+
+    for day in options.days or sorted(utils.generators.GENERATORS):
+        results = run_scaling(
+            day,
+            parts=options.parts,
+            sizes=options.sizes,
+            seed=options.seed,
+            repeats=options.repeats,
+            track_memory=not options.no_memory,
+            max_time=options.max_time,
+        )
+
+        output_path = os.path.join(options.output, f"day{day:02d}")
+        with open(f"{output_path}.json", "w") as f:
+            json.dump(
+                {part: [asdict(point) for point in points] for part, points in results.items()},
+                f,
+                indent=2,
+            )
+        if not plot(day, results, f"{output_path}.png"):
+            print("matplotlib not installed: skipping plots")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""Solver server keeping a pool of warm worker processes, so that solving an input only costs the solver's time, not
+the interpreter startup and the import of solutions and their dependencies (numpy, sympy, scipy...).
+
+Run from the repository root, e.g.
+    PYTHONPATH=src python -m utils.server serve --workers 4                  # localhost TCP
+    PYTHONPATH=src python -m utils.server serve --socket /tmp/aoc.sock 11 15  # Unix socket, only days 11 and 15
+    PYTHONPATH=src python -m utils.server solve 15 2 input/day15.txt --kwargs '{"grid_size": 4000000}'
+
+Requests and responses are JSON objects, one per line:
+    {"id": 0, "day": 15, "part": 2, "input_file": "input/day15.txt", "kwargs": {"grid_size": 4000000}}
+    {"id": 0, "answer": 11379394658764, "time": 4.2, "error": null}
+A client may send many requests without waiting: they are solved concurrently, and each response is sent as soon as
+it is ready (with the id of its request, if any).
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+
+import utils.lazy
+import utils.run
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8642
+
+# Unix socket path, or (host, port)
+Address = Union[str, Tuple[str, int]]
+
+
+####################################
+# Worker processes
+####################################
+def _init_worker(days: Sequence[int]) -> None:
+    """Import solutions and their lazily imported dependencies"""
+    # Ctrl-C stops the server, which then stops its workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Some solvers print a lot (e.g. day07 prints its tree), which is not part of their answer
+    sys.stdout = open(os.devnull, "w")
+    for day in days:
+        utils.lazy.preload(importlib.import_module(f"{utils.run.day_string(day)}.solution"))
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _solve(day: int, part: int, input_file: str, solver_kwargs: Dict) -> Tuple[Any, float]:
+    """Answer and solver time (s)"""
+    solution = importlib.import_module(f"{utils.run.day_string(day)}.solution")
+    solver = getattr(solution, f"solve_part_{part}")
+    start = time.perf_counter()
+    answer = solver(input_file, **solver_kwargs)
+    return answer, time.perf_counter() - start
+
+
+def _to_json(value: Any) -> Any:
+    # numpy scalars
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+####################################
+# Server
+####################################
+class SolverServer:
+    """Serves solve requests with a pool of worker processes, which import solutions once when started"""
+
+    def __init__(self, days: Sequence[int] = None, workers: int = 1) -> None:
+        """
+        Args:
+            days (Sequence[int], optional): Days imported by workers when started (others are imported on first
+                request). Defaults to None (all days).
+            workers (int, optional): Number of worker processes. Defaults to 1.
+        """
+        self.days = list(utils.run.find_days() if days is None else days)
+        self.workers = workers
+        self.executor = self.__new_executor()
+
+    def __new_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.days,)
+        )
+
+    async def start_workers(self) -> None:
+        """Start all workers, waiting for them to be ready"""
+        loop = asyncio.get_running_loop()
+        # Workers are started on demand, so that concurrent tasks start all of them
+        await asyncio.gather(
+            *[loop.run_in_executor(self.executor, _ping) for __ in range(self.workers)]
+        )
+
+    async def solve(self, request: Dict) -> Dict:
+        """Response to a request (see module documentation)"""
+        response: Dict[str, Any] = {"id": request.get("id"), "answer": None, "time": None}
+        try:
+            args = (
+                int(request["day"]),
+                int(request["part"]),
+                request["input_file"],
+                request.get("kwargs") or {},
+            )
+            loop = asyncio.get_running_loop()
+            executor = self.executor
+            answer, duration = await loop.run_in_executor(executor, _solve, *args)
+            response.update(answer=answer, time=duration, error=None)
+        except concurrent.futures.process.BrokenProcessPool:
+            # A worker died (e.g. killed by OOM killer), which makes the pool unusable: later requests get a new one
+            response["error"] = traceback.format_exc()
+            if self.executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = self.__new_executor()
+        except Exception:
+            response["error"] = traceback.format_exc()
+        return response
+
+    async def __respond(
+        self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock
+    ) -> None:
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            response = {"id": None, "answer": None, "time": None, "error": "Invalid JSON request"}
+        else:
+            response = await self.solve(request)
+
+        data = json.dumps(response, default=_to_json).encode() + b"\n"
+        async with write_lock:
+            writer.write(data)
+            await writer.drain()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer requests of a client until it closes its connection"""
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    tasks.add(asyncio.create_task(self.__respond(line, writer, write_lock)))
+            await asyncio.gather(*tasks)
+        except ConnectionError:
+            # Client left without waiting for its answers
+            for task in tasks:
+                task.cancel()
+        finally:
+            writer.close()
+
+    async def serve(self, address: Address) -> None:
+        """Start workers, then serve requests on address until cancelled"""
+        await self.start_workers()
+        if isinstance(address, str):
+            server = await asyncio.start_unix_server(self.handle_connection, path=address)
+        else:
+            server = await asyncio.start_server(self.handle_connection, *address)
+
+        print(f"Serving days {self.days} with {self.workers} worker(s) on {address}", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+            if isinstance(address, str) and os.path.exists(address):
+                os.remove(address)
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+
+####################################
+# Client
+####################################
+class SolverClient:
+    """Blocking client of a SolverServer"""
+
+    def __init__(self, address: Address = (DEFAULT_HOST, DEFAULT_PORT)) -> None:
+        if isinstance(address, str):
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.connect(address)
+        self.file = self.socket.makefile("rwb")
+
+    def __enter__(self) -> "SolverClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
+
+    def solve_many(self, requests: Iterable[Tuple[int, int, str, Dict]]) -> List[Dict]:
+        """Send all requests at once, then wait for their responses
+
+        Args:
+            requests (Iterable[Tuple[int, int, str, Dict]]): Day, part, input file and solver arguments of each request
+
+        Returns:
+            List[Dict]: Response of each request, in the order of requests
+        """
+        n_requests = 0
+        for ind, (day, part, input_file, solver_kwargs) in enumerate(requests):
+            request = {
+                "id": ind,
+                "day": day,
+                "part": part,
+                "input_file": os.path.abspath(input_file),
+                "kwargs": solver_kwargs,
+            }
+            self.file.write(json.dumps(request).encode() + b"\n")
+            n_requests += 1
+        self.file.flush()
+
+        responses: List[Dict] = [None] * n_requests
+        for __ in range(n_requests):
+            line = self.file.readline()
+            if not line:
+                raise ConnectionError("Server closed connection")
+            response = json.loads(line)
+            responses[response["id"]] = response
+        return responses
+
+    def solve(self, day: int, part: int, input_file: str, **solver_kwargs) -> Dict:
+        return self.solve_many([(day, part, input_file, solver_kwargs)])[0]
+
+
+def _address(options: argparse.Namespace) -> Address:
+    return options.socket or (options.host, options.port)
+
+
+def main(args: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve solvers from warm worker processes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Start server")
+    serve_parser.add_argument("days", type=int, nargs="*", help="Days to preload (default: all)")
+    serve_parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    solve_parser = subparsers.add_parser("solve", help="Send a request to a running server")
+    solve_parser.add_argument("day", type=int)
+    solve_parser.add_argument("part", type=int)
+    solve_parser.add_argument("input_file")
+    solve_parser.add_argument(
+        "--kwargs", type=json.loads, default={}, help="Solver arguments (JSON)"
+    )
+    for subparser in (serve_parser, solve_parser):
+        subparser.add_argument("--socket", help="Unix socket path (default: localhost TCP)")
+        subparser.add_argument("--host", default=DEFAULT_HOST)
+        subparser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    options = parser.parse_args(args)
+
+    if options.command == "serve":
+        server = SolverServer(days=options.days or None, workers=options.workers)
+        try:
+            asyncio.run(server.serve(_address(options)))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    with SolverClient(_address(options)) as client:
+        response = client.solve(options.day, options.part, options.input_file, **options.kwargs)
+    if response["error"]:
+        print(response["error"], file=sys.stderr)
+        return 1
+    print(f"{response['answer']} ({response['time']:.4f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
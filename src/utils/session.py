@@ -0,0 +1,54 @@
+import importlib
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class Session:
+    """Solves parts of a day on one input file, sharing named values (e.g. parsed input or precomputations)
+    between them, so that solving both parts costs one parse.
+
+    Solutions using sessions define part_<N>(session, **kwargs) functions, solve_part_<N>(input_file, **kwargs)
+    being a thin wrapper creating a session, e.g.
+        def part_1(session: utils.Session) -> int:
+            topo_map = session.get("map", parse_data_as_map, session.input_file)
+            ...
+
+        def solve_part_1(input_file: str) -> int:
+            return part_1(utils.Session(12, input_file))
+    """
+
+    def __init__(self, day: int, input_file: str) -> None:
+        """
+        Args:
+            day (int): Day
+            input_file (str): Input file path
+        """
+        self.day = day
+        self.input_file = input_file
+        self._values: Dict[str, Any] = {}
+
+    def get(self, name: str, compute: Callable[..., T], *args, **kwargs) -> T:
+        """Value named name, computed as compute(*args, **kwargs) the first time it is requested.
+        Values are shared between parts, so they should not be modified (or should be reset before use).
+
+        Args:
+            name (str): Name of value. Arguments are not part of the key, so they should not vary between calls.
+            compute (Callable[..., T]): Function computing value
+
+        Returns:
+            T: Value
+        """
+        if name not in self._values:
+            self._values[name] = compute(*args, **kwargs)
+        return self._values[name]
+
+    def solve(self, part: int, **solver_kwargs) -> Any:
+        """Solve part of the day with its part_<N> function, or with solve_part_<N> if the solution does not use
+        sessions (in which case nothing is shared)
+        """
+        solution = importlib.import_module(f"day{self.day:02d}.solution")
+        solver = getattr(solution, f"part_{part}", None)
+        if solver is None:
+            return getattr(solution, f"solve_part_{part}")(self.input_file, **solver_kwargs)
+        return solver(self, **solver_kwargs)
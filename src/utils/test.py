@@ -1,13 +1,51 @@
 import importlib
 import os
-from typing import Callable, Dict, Union
+import time
+from typing import Callable, Dict, Iterator, List, Tuple, Type, Union
 
 import pytest
 
+import utils.benchmark
+import utils.env
+import utils.importtime
+import utils.profiling
+import utils.results
+import utils.run
+import utils.session
+
 Result = Union[str, int]
 
+# Setting this environment variable to anything but "" or "0" also checks import time budgets, which depend on
+# machine load, hence are not checked by default
+IMPORT_TIME_ENV = "AOC_IMPORT_TIME"
+# Import time budgets are multiplied by this factor (e.g. "2" on a slow machine)
+IMPORT_BUDGET_SCALE_ENV = "AOC_IMPORT_BUDGET_SCALE"
+# Slow to import modules, which solutions should only import when used (see utils.lazy)
+HEAVY_MODULES = ("dijkstar", "matplotlib", "numpy", "pytest", "scipy", "skimage", "sympy")
+# Solver time budgets are multiplied by this factor
+TIME_BUDGET_SCALE_ENV = "AOC_TIME_BUDGET_SCALE"
+# Number of processes running solver tests ("auto" for one per CPU). When more than 1, solvers of all collected tests
+# are started in worker processes by the first solver test, so that days run concurrently. Defaults to 1 (solvers
+# run in the pytest process, one test after another).
+TEST_WORKERS_ENV = "AOC_TEST_WORKERS"
+
+# Solver tests --> (part, whether example input is used)
+SOLVER_TESTS = {
+    "part_1_example": (1, True),
+    "part_1": (1, False),
+    "part_2_example": (2, True),
+    "part_2": (2, False),
+}
+
+
+def solver_test_workers() -> int:
+    value = os.environ.get(TEST_WORKERS_ENV, "1").strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    return int(value or 1)
+
 
-class TestSolutionTemplate:
+class TestSolutionTemplate(utils.benchmark.BenchmarkSolutionTemplate):
     day: int = None
 
     part_1_example_result: Result = None
@@ -21,23 +59,60 @@ class TestSolutionTemplate:
     part_1_kwargs: Dict = {}
     part_2_kwargs: Dict = {}
 
-    def _init_members(self):
-        self.day_string = (
-            None if self.day is None else f"day0{self.day}" if self.day <= 9 else f"day{self.day}"
+    # Heavy modules (see HEAVY_MODULES) imported when importing the solution module
+    eager_imports: Tuple[str, ...] = ()
+    # Maximum import time of the solution module in a fresh interpreter (in seconds), which covers its
+    # dependencies. Days importing numpy need more. Only checked if enabled (see IMPORT_TIME_ENV).
+    import_time_budget: float = 0.15
+
+    # Maximum time of each solver test (in seconds), None for no limit. Multiplied by the number of workers when
+    # solvers run concurrently (see TEST_WORKERS_ENV).
+    part_1_example_time_budget: float = None
+    part_2_example_time_budget: float = None
+    part_1_time_budget: float = None
+    part_2_time_budget: float = None
+
+    @classmethod
+    def _init_members(cls):
+        # Members are shared by all tests of a class (pytest creates an instance per test)
+        if "solution" in cls.__dict__:
+            return
+
+        cls.day_string = (
+            None if cls.day is None else f"day0{cls.day}" if cls.day <= 9 else f"day{cls.day}"
         )
 
-        self.example_file = None if self.day is None else f"example_input/{self.day_string}.txt"
-        self.input_file = None if self.day is None else f"input/{self.day_string}.txt"
+        cls.example_file = None if cls.day is None else f"example_input/{cls.day_string}.txt"
+        cls.input_file = None if cls.day is None else f"input/{cls.day_string}.txt"
 
-        self.solution = (
-            None if self.day is None else importlib.import_module(f"{self.day_string}.solution")
+        cls.solution = (
+            None if cls.day is None else importlib.import_module(f"{cls.day_string}.solution")
         )
 
-        self.part_1_solver: Callable[[str], int] = (
-            None if self.solution is None else self.solution.solve_part_1
+        # Solvers are profiled if enabled for the day (see utils.profiling.PROFILE_ENV). Static, so that reading
+        # them through an instance (e.g. self.part_1_solver) does not bind them. They do not use the result cache,
+        # as benchmarks time them.
+        cls.part_1_solver: Callable[[str], int] = (
+            None
+            if cls.solution is None
+            else staticmethod(utils.profiling.profiler.wrap(cls.solution.solve_part_1))
         )
-        self.part_2_solver: Callable[[str], int] = (
-            None if self.solution is None else self.solution.solve_part_2
+        cls.part_2_solver: Callable[[str], int] = (
+            None
+            if cls.solution is None
+            else staticmethod(utils.profiling.profiler.wrap(cls.solution.solve_part_2))
+        )
+
+    @classmethod
+    def _solver_test_config(cls, name: str) -> Tuple[Callable, str, Dict, Result]:
+        """Solver, input file, solver arguments and expected result of solver test name (e.g. "part_1_example")"""
+        cls._init_members()
+        part, example = SOLVER_TESTS[name]
+        return (
+            getattr(cls, f"part_{part}_solver"),
+            cls.example_file if example else cls.input_file,
+            getattr(cls, f"{name}_kwargs"),
+            getattr(cls, f"{name}_result"),
         )
 
     @classmethod
@@ -45,51 +120,164 @@ class TestSolutionTemplate:
         """Setup function called before member test functions. Should be defined in derived classes to set test results or override default members"""
         raise NotImplementedError()
 
+    @pytest.fixture
+    def solver_pool(self, request) -> "SolverPool":
+        return SolverPool.get(request.session) if solver_test_workers() > 1 else None
+
     # Done tis way instead of using @pytest.mark.parametrize decorator due to repetitive nature of tests with fixed input files and output format
-    def _run_test(
-        self,
-        solver: Callable[[str], int] = None,
-        input_file: str = None,
-        solver_kwargs: Dict = {},
-        result: int = None,
-    ) -> None:
+    def _run_test(self, name: str, solver_pool: "SolverPool" = None) -> None:
+        solver, input_file, solver_kwargs, result = self._solver_test_config(name)
         if solver is None or not os.path.exists(input_file) or result is None:
             pytest.skip("Test not configured")
+
+        part, __ = SOLVER_TESTS[name]
+        # Answers found in the result cache (see utils.results) have no duration to check
+        found, answer = utils.results.result_cache.get(self.day, part, input_file, solver_kwargs)
+        if found:
+            duration = None
+        elif solver_pool is None:
+            start = time.perf_counter()
+            answer = solver(input_file, **solver_kwargs)
+            duration = time.perf_counter() - start
+            utils.results.result_cache.put(self.day, part, input_file, solver_kwargs, answer)
         else:
-            assert solver(input_file, **solver_kwargs) == result
+            job_result = solver_pool.result(type(self), name)
+            if job_result.status == "error":
+                pytest.fail(f"Solver failed in worker process:\n{job_result.error}")
+            answer, duration = job_result.answer, job_result.median_time()
 
-    def test_part_1_example(self):
-        self._init_members()
-        self._run_test(
-            solver=self.part_1_solver,
-            input_file=self.example_file,
-            solver_kwargs=self.part_1_example_kwargs,
-            result=self.part_1_example_result,
-        )
+        assert answer == result, f"{name} answer {answer!r} != {result!r}"
+
+        budget = getattr(self, f"{name}_time_budget")
+        if budget is not None and duration is not None:
+            budget *= float(os.environ.get(TIME_BUDGET_SCALE_ENV, 1))
+            if solver_pool is not None:
+                # Solvers running concurrently share CPUs and memory bandwidth
+                budget *= solver_test_workers()
+            assert duration <= budget, f"{name} takes {duration:.3f}s (budget {budget:.3f}s)"
+
+    def test_part_1_example(self, solver_pool):
+        self._run_test("part_1_example", solver_pool)
 
-    def test_part_1(self):
+    def test_part_1(self, solver_pool):
+        self._run_test("part_1", solver_pool)
+
+    def test_part_2_example(self, solver_pool):
+        self._run_test("part_2_example", solver_pool)
+
+    def test_part_2(self, solver_pool):
+        self._run_test("part_2", solver_pool)
+
+    def test_session_example(self):
+        """Both parts solved with one session (see utils.session), sharing its values"""
         self._init_members()
-        self._run_test(
-            solver=self.part_1_solver,
-            input_file=self.input_file,
-            solver_kwargs=self.part_1_kwargs,
-            result=self.part_1_result,
-        )
+        if self.solution is None or not hasattr(self.solution, "part_1"):
+            pytest.skip("Solution does not use sessions")
+        if not os.path.exists(self.example_file):
+            pytest.skip("Test not configured")
 
-    def test_part_2_example(self):
+        session = utils.session.Session(self.day, self.example_file)
+        for part in (1, 2):
+            result = getattr(self, f"part_{part}_example_result")
+            if result is not None:
+                solver_kwargs = getattr(self, f"part_{part}_example_kwargs")
+                assert session.solve(part, **solver_kwargs) == result
+
+    def test_import_time(self):
         self._init_members()
-        self._run_test(
-            solver=self.part_2_solver,
-            input_file=self.example_file,
-            solver_kwargs=self.part_2_example_kwargs,
-            result=self.part_2_example_result,
+        if self.solution is None:
+            pytest.skip("Test not configured")
+
+        check_time = utils.env.flag(IMPORT_TIME_ENV)
+        report = utils.importtime.measure_import(
+            self.solution.__name__, repeats=3 if check_time else 1
         )
 
-    def test_part_2(self):
-        self._init_members()
-        self._run_test(
-            solver=self.part_2_solver,
-            input_file=self.input_file,
-            solver_kwargs=self.part_2_kwargs,
-            result=self.part_2_result,
+        imported = {entry.module.split(".")[0] for entry in report.imports}
+        unexpected = sorted(imported.intersection(HEAVY_MODULES).difference(self.eager_imports))
+        assert not unexpected, f"Import loads {unexpected}\n{report.report()}"
+
+        if check_time:
+            budget = self.import_time_budget * float(os.environ.get(IMPORT_BUDGET_SCALE_ENV, 1))
+            assert (
+                report.total_time <= budget
+            ), f"Import takes {report.total_time:.3f}s (budget {budget:.3f}s)\n{report.report()}"
+
+
+class SolverPool:
+    """Solvers of the solver tests collected in a pytest session, all started at once in worker processes
+    (see utils.run.iter_jobs). Results are collected as tests wait for them. Cached answers (see utils.results) are
+    used without starting their solver.
+    """
+
+    # pytest session --> its pool
+    _pools: Dict[pytest.Session, "SolverPool"] = {}
+
+    def __init__(self, tests: List[Tuple[Type[TestSolutionTemplate], str]], workers: int) -> None:
+        """
+        Args:
+            tests (List[Tuple[Type[TestSolutionTemplate], str]]): Test class and solver test name (e.g. "part_1") of
+                each test
+            workers (int): Number of worker processes
+        """
+        self.results: Dict[Tuple[Type[TestSolutionTemplate], str], utils.run.JobResult] = {}
+        self.tests = []
+        jobs = []
+        for test_class, name in tests:
+            solver, input_file, solver_kwargs, result = test_class._solver_test_config(name)
+            # Unconfigured tests are skipped without waiting
+            if solver is None or not os.path.exists(input_file) or result is None:
+                continue
+            part, __ = SOLVER_TESTS[name]
+            found, answer = utils.results.result_cache.get(
+                test_class.day, part, input_file, solver_kwargs
+            )
+            if found:
+                job = utils.run.Job(test_class.day, part, input_file, solver_kwargs, result)
+                status = "ok" if answer == result else "wrong"
+                # No times, as the solver did not run
+                self.results[(test_class, name)] = utils.run.JobResult(job, status, answer)
+                continue
+            self.tests.append((test_class, name))
+            jobs.append(utils.run.Job(test_class.day, part, input_file, solver_kwargs, result))
+        self._job_results: Iterator[Tuple[int, utils.run.JobResult]] = utils.run.iter_jobs(
+            jobs, workers=workers
         )
+
+    @classmethod
+    def get(cls, session: pytest.Session) -> "SolverPool":
+        """Pool of session, started on first call"""
+        pool = cls._pools.get(session)
+        if pool is None:
+            tests = []
+            for item in session.items:
+                test_class = getattr(item, "cls", None)
+                name = getattr(item, "originalname", "").removeprefix("test_")
+                if (
+                    test_class is not None
+                    and issubclass(test_class, TestSolutionTemplate)
+                    and name in SOLVER_TESTS
+                ):
+                    # Sets results and arguments, as done by pytest before running the class's tests
+                    test_class.setup_class(test_class)
+                    tests.append((test_class, name))
+            pool = cls._pools[session] = cls(tests, workers=solver_test_workers())
+            session.config.add_cleanup(pool.close)
+        return pool
+
+    def result(self, test_class: Type[TestSolutionTemplate], name: str) -> utils.run.JobResult:
+        """Result of solver test, waiting for it if still running"""
+        key = (test_class, name)
+        while key not in self.results:
+            ind, job_result = next(self._job_results)
+            self.results[self.tests[ind]] = job_result
+            if job_result.status in ("ok", "wrong"):
+                job = job_result.job
+                utils.results.result_cache.put(
+                    job.day, job.part, job.input_file, job.solver_kwargs, job_result.answer
+                )
+        return self.results[key]
+
+    def close(self) -> None:
+        """Stop solvers still running"""
+        self._job_results.close()
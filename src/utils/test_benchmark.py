@@ -0,0 +1,60 @@
+import json
+import os
+
+import pytest
+
+import day02.test_solution
+import utils.benchmark
+import utils.cache
+
+
+def test_benchmark_update_then_compare(monkeypatch, tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    monkeypatch.setenv(utils.benchmark.BASELINE_ENV, str(baseline_path))
+    monkeypatch.setenv(utils.benchmark.REPEATS_ENV, "1")
+    monkeypatch.setattr(utils.benchmark, "RESULTS_PATH", str(tmp_path / "results.json"))
+
+    test_class = day02.test_solution.TestSolution
+    test_class.setup_class(test_class)
+
+    # Stores baseline
+    monkeypatch.setenv(utils.benchmark.BENCHMARK_ENV, "update")
+    test_class().test_part_1_example_benchmark()
+    with open(baseline_path) as f:
+        assert "day02.part_1_example" in json.load(f)
+
+    # Compares to it (a tiny solver is always within noise of its baseline)
+    monkeypatch.setenv(utils.benchmark.BENCHMARK_ENV, "1")
+    test_class().test_part_1_example_benchmark()
+
+
+def test_disabled_benchmark_skips_before_setup(monkeypatch):
+    monkeypatch.setenv(utils.benchmark.BENCHMARK_ENV, "0")
+
+    class FreshTestSolution(day02.test_solution.TestSolution):
+        pass
+
+    FreshTestSolution.setup_class(FreshTestSolution)
+    with pytest.raises(pytest.skip.Exception):
+        FreshTestSolution().test_part_1_benchmark()
+    # Solution was not imported and wrapped
+    assert "solution" not in FreshTestSolution.__dict__
+
+
+def test_benchmark_without_baseline_fails(monkeypatch, tmp_path):
+    monkeypatch.setenv(utils.benchmark.BASELINE_ENV, str(tmp_path / "baseline.json"))
+    monkeypatch.setenv(utils.benchmark.REPEATS_ENV, "1")
+    monkeypatch.setenv(utils.benchmark.BENCHMARK_ENV, "1")
+    monkeypatch.setattr(utils.benchmark, "RESULTS_PATH", str(tmp_path / "results.json"))
+
+    test_class = day02.test_solution.TestSolution
+    test_class.setup_class(test_class)
+    with pytest.raises(pytest.fail.Exception, match="No baseline"):
+        test_class().test_part_1_example_benchmark()
+
+
+def test_benchmark_disables_caches(monkeypatch):
+    monkeypatch.delenv(utils.cache.NO_CACHE_ENV, raising=False)
+    with utils.benchmark.caches_disabled():
+        assert utils.cache.cache_disabled()
+    assert utils.cache.NO_CACHE_ENV not in os.environ
@@ -0,0 +1,47 @@
+import os
+
+import utils.cache
+
+
+def test_disk_cache_eviction(tmp_path):
+    cache = utils.cache.DiskCache("test", max_size_bytes=4096, directory=str(tmp_path))
+    for ind in range(100):
+        cache.put(f"key{ind}", bytes(256))
+
+    entries = list(os.scandir(cache.directory))
+    assert sum(entry.stat().st_size for entry in entries) <= 4096
+    # Most recent entries are kept
+    assert cache.get("key99") == (True, bytes(256))
+    assert cache.get("key0") == (False, None)
+
+
+def test_disk_cache_entry_removed_by_other_process(tmp_path):
+    cache = utils.cache.DiskCache("test", directory=str(tmp_path))
+    cache.put("key", [1, 2, 3])
+    for entry in os.scandir(cache.directory):
+        os.remove(entry.path)
+
+    assert cache.get("key") == (False, None)
+    cache.evict()
+    cache.put("key", [1, 2, 3])
+    assert cache.get("key") == (True, [1, 2, 3])
+
+
+def make_scaler(factor: int):
+    def scale(value: int) -> int:
+        return value * factor
+
+    return scale
+
+
+def test_hash_callable_distinguishes_lambdas_and_closures():
+    parse_int, parse_float = lambda line: int(line), lambda line: float(line)
+    assert parse_int.__qualname__ == parse_float.__qualname__
+    assert utils.cache.hash_callable(parse_int) != utils.cache.hash_callable(parse_float)
+    assert utils.cache.hash_callable(lambda line: line[1:]) != utils.cache.hash_callable(
+        lambda line: line[2:]
+    )
+
+    double, triple = make_scaler(2), make_scaler(3)
+    assert utils.cache.hash_callable(double) != utils.cache.hash_callable(triple)
+    assert utils.cache.hash_callable(double) == utils.cache.hash_callable(make_scaler(2))
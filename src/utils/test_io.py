@@ -0,0 +1,172 @@
+import time
+
+import pytest
+
+import utils.cache
+import utils.io
+
+
+def test_parallel_parse_matches_serial_with_crlf(tmp_path):
+    path = tmp_path / "input.txt"
+    # Blank lines are "\r" before their line ending
+    groups = [f"{ind}a\r\n{ind}b\r\n\r\n" for ind in range(20)]
+    path.write_bytes("".join(groups).encode())
+
+    def parser(workers: int) -> utils.io.FileParser:
+        return utils.io.FileParser(
+            data_parser=tuple, line_group_size=2, workers=workers, use_cache=False
+        )
+
+    serial = parser(workers=1).parse_file(str(path))
+    assert serial[:2] == [("0a", "0b"), ("1a", "1b")]
+    assert parser(workers=3).parse_file(str(path)) == serial
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"abcd\nabcd\nabcd\n",
+        b"abcd\nabcd\nabcd",
+        b"abcd\r\nabcd\r\nabcd\r\n",
+        b"abcd\r\nabcd\r\nabcd",
+    ],
+)
+def test_read_file_as_grid(tmp_path, content):
+    path = tmp_path / "grid.txt"
+    path.write_bytes(content)
+    grid = utils.io.read_file_as_grid(str(path))
+    assert grid.shape == (3, 4)
+    assert bytes(grid[2]) == b"abcd"
+
+
+@pytest.mark.parametrize("content", [b"abcd\nabcd\nab", b"abcd\nabcd\nab\n", b"abcd\nab\nabcd\n"])
+def test_read_file_as_grid_ragged(tmp_path, content):
+    path = tmp_path / "grid.txt"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        utils.io.read_file_as_grid(str(path))
+
+
+def test_read_file_as_grid_comments(tmp_path):
+    path = tmp_path / "grid.txt"
+    path.write_bytes(b"abcd\nabcd\nabcd# comment\n")
+    grid = utils.io.read_file_as_grid(str(path), comments="#")
+    assert grid.shape == (3, 4)
+    assert bytes(grid[2]) == b"abcd"
+
+
+def best_time(func, repeats: int = 5) -> float:
+    durations = []
+    for __ in range(repeats):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+@pytest.mark.parametrize("content", ["", "1\n2\n\n3", "1\r\n2\r\n\r\n3\r\n", "12345\n" * 10])
+@pytest.mark.parametrize("group_size", [1, 2])
+def test_streaming_matches_list(tmp_path, monkeypatch, content, group_size):
+    path = tmp_path / "input.txt"
+    path.write_bytes(content.encode())
+    # Lines and groups straddle blocks
+    monkeypatch.setattr(utils.io, "READ_BLOCK_SIZE", 4)
+
+    assert list(utils.io.iter_file_lines(str(path))) == utils.io.read_file_lines(str(path))
+    for strip_empty_lines in (True, False):
+        parser = utils.io.FileParser(
+            data_parser=tuple,
+            strip_empty_lines=strip_empty_lines,
+            line_group_size=group_size,
+            use_cache=False,
+        )
+        assert list(parser.iter_file(str(path))) == parser.parse_file(str(path))
+
+
+def test_read_lines_not_slower_than_read_split(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("\n".join(map(str, range(200_000))))
+
+    def read_split():
+        with open(path) as f:
+            return [int(line) for line in f.read().split("\n") if line]
+
+    parser = utils.io.FileParser(data_parser=int, use_cache=False)
+    assert parser.parse_file(str(path)) == read_split()
+    reference = best_time(read_split)
+    # Margin for timing noise
+    assert best_time(lambda: parser.parse_file(str(path))) < 1.5 * reference
+    assert best_time(lambda: utils.io.read_file_lines(str(path))) < 1.5 * reference
+
+
+MOVES_REGEX = r"^(?P<direction>[A-Z]+) (?P<distance>-?\d+)$"
+
+
+def write_moves(tmp_path, content: str) -> str:
+    path = tmp_path / "moves.txt"
+    path.write_text(content)
+    return str(path)
+
+
+def test_read_file_as_columns_ints(tmp_path):
+    path = write_moves(tmp_path, "1,2\n-3,40\n")
+    array = utils.io.read_file_as_columns(path, r"(?P<x>-?\d+),(?P<y>-?\d+)")
+    assert array["x"].tolist() == [1, -3]
+    assert array["y"].tolist() == [2, 40]
+    assert array.dtype["x"] == "int64"
+
+
+@pytest.mark.parametrize(
+    "dtype, expected",
+    [(str, ["R", "UP", "L"]), ("U1", ["R", "U", "L"]), (bytes, [b"R", b"UP", b"L"])],
+)
+def test_read_file_as_columns_strings(tmp_path, dtype, expected):
+    path = write_moves(tmp_path, "R 4\nUP -2\nL 10")
+    array = utils.io.read_file_as_columns(path, MOVES_REGEX, dtypes={"direction": dtype})
+    assert array["direction"].tolist() == expected
+    assert array["distance"].tolist() == [4, -2, 10]
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_read_file_as_columns_as_dict(tmp_path, batch_size):
+    # Longest direction is in the last batch
+    path = write_moves(tmp_path, "R 4\nU 2\nL 1\nDOWN 3\n")
+    columns = utils.io.read_file_as_columns(
+        path, MOVES_REGEX, dtypes={"direction": str}, as_dict=True, batch_size=batch_size
+    )
+    assert list(columns) == ["direction", "distance"]
+    assert columns["direction"].tolist() == ["R", "U", "L", "DOWN"]
+    assert columns["distance"].tolist() == [4, 2, 1, 3]
+
+
+def test_read_file_as_columns_empty_file(tmp_path):
+    path = write_moves(tmp_path, "")
+    array = utils.io.read_file_as_columns(path, MOVES_REGEX, dtypes={"direction": str})
+    assert len(array) == 0
+    assert array.dtype.names == ("direction", "distance")
+    columns = utils.io.read_file_as_columns(path, MOVES_REGEX, as_dict=True)
+    assert [len(column) for column in columns.values()] == [0, 0]
+
+
+def test_parse_cache_keeps_lambdas_apart(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        utils.io, "parse_cache", utils.cache.DiskCache("test", directory=str(tmp_path / "cache"))
+    )
+    path = tmp_path / "input.txt"
+    path.write_text("1\n2\n")
+
+    as_ints = utils.io.FileParser(data_parser=lambda line: int(line), use_cache=True)
+    as_floats = utils.io.FileParser(data_parser=lambda line: float(line) / 2, use_cache=True)
+    assert as_ints.parse_file(str(path)) == [1, 2]
+    assert as_floats.parse_file(str(path)) == [0.5, 1.0]
+    # Cache hit
+    assert as_ints.parse_file(str(path)) == [1, 2]
+
+
+@pytest.mark.parametrize("options", [{"digits": True}, {"comments": "#"}])
+def test_read_file_as_grid_memory_map_rejects_copies(tmp_path, options):
+    path = tmp_path / "grid.txt"
+    path.write_bytes(b"1234\n5678\n")
+    assert utils.io.read_file_as_grid(str(path), memory_map=True).shape == (2, 4)
+    with pytest.raises(ValueError):
+        utils.io.read_file_as_grid(str(path), memory_map=True, **options)
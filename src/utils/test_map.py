@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from utils.map import (
+    NEIGHBOR_OFFSETS,
+    Grid,
+    ManhattanDistance,
+    MapExtent,
+    MapPosition,
+    PositionArray,
+    TileMap,
+)
+
+
+def enter_cost(value, neighbor_value):
+    return neighbor_value
+
+
+def reference_costs(values: np.ndarray, offsets, source: MapPosition) -> np.ndarray:
+    """Cheapest path costs by relaxing all moves until nothing changes (Bellman-Ford)"""
+    height, width = values.shape
+    costs = np.full(values.shape, np.inf)
+    costs[source.s_] = 0
+    changed = True
+    while changed:
+        changed = False
+        for y in range(height):
+            for x in range(width):
+                for dx, dy in offsets:
+                    ny, nx = y + dy, x + dx
+                    if 0 <= ny < height and 0 <= nx < width:
+                        cost = costs[y, x] + values[ny, nx]
+                        if cost < costs[ny, nx]:
+                            costs[ny, nx] = cost
+                            changed = True
+    return costs
+
+
+def test_weighted_grid_avoids_expensive_cells():
+    values = np.array([[1, 9, 1], [1, 9, 1], [1, 1, 1]])
+    grid = Grid(values, move_cost=enter_cost)
+    source, target = MapPosition(0, 0), MapPosition(2, 0)
+
+    costs = grid.dijkstra(source)
+    assert costs[target.s_] == 6
+    assert costs[MapPosition(1, 0).s_] == 9
+    assert grid.astar(source, target) == 6
+    # Backwards, costs are those of entering the cells of the path from the source
+    assert grid.dijkstra(target, reverse=True)[source.s_] == 6
+    assert grid.astar(source, target, reverse=True) == 6
+
+
+def test_weighted_grid_unreachable_target():
+    values = np.array([[1, 0, 1], [1, 0, 1]])
+    grid = Grid(
+        values, can_move=lambda value, neighbor_value: neighbor_value > 0, move_cost=enter_cost
+    )
+
+    assert np.isinf(grid.dijkstra(MapPosition(0, 0))[0, 2])
+    assert np.isinf(grid.astar(MapPosition(0, 0), MapPosition(2, 1)))
+
+
+@pytest.mark.parametrize("connectivity", [4, 8])
+def test_weighted_grid_matches_reference(connectivity):
+    values = np.random.default_rng(connectivity).integers(1, 10, size=(6, 7))
+    grid = Grid(values, connectivity=connectivity, move_cost=enter_cost)
+    source = MapPosition(1, 2)
+
+    expected = reference_costs(values, grid.offsets, source)
+    assert np.array_equal(grid.dijkstra(source), expected)
+    for target in (MapPosition(6, 5), MapPosition(0, 0), MapPosition(4, 1)):
+        assert grid.astar(source, target) == expected[target.s_]
+
+
+def test_tile_map_get_set_matches_dense():
+    rng = np.random.default_rng(0)
+    coordinates = rng.integers(-10, 10, size=(200, 2))
+    values = rng.integers(1, 256, size=len(coordinates))
+    tile_map = TileMap(tile_shape=(4, 4), dtype=np.int64)
+    tile_map.set(coordinates, values)
+
+    # Last value set at duplicated coordinates wins
+    dense = np.zeros((20, 20), dtype=np.int64)
+    dense[tuple((coordinates + 10).T)] = values
+    queried = rng.integers(-12, 12, size=(300, 2))
+    expected = [
+        dense[y + 10, x + 10] if -10 <= min(y, x) and max(y, x) < 10 else 0 for y, x in queried
+    ]
+    assert tile_map.get(queried).tolist() == expected
+
+
+POSITIONS = [MapPosition(0, 0), MapPosition(3, 1), MapPosition(2, 2), MapPosition(-1, 4)]
+
+
+def test_position_array_neighbors():
+    sources, neighbors = PositionArray.from_positions(POSITIONS).neighbors()
+    # Grouped by direction
+    expected = [
+        (ind, position + MapPosition(dx, dy))
+        for dx, dy in NEIGHBOR_OFFSETS
+        for ind, position in enumerate(POSITIONS)
+    ]
+    assert list(zip(sources.tolist(), neighbors)) == expected
+
+
+def test_position_array_neighbors_in_extent():
+    map_extent = MapExtent([MapPosition(0, 0), MapPosition(3, 3)])
+    sources, neighbors = PositionArray.from_positions(POSITIONS).neighbors(map_extent)
+
+    expected = sorted(
+        (ind, neighbor)
+        for ind, position in enumerate(POSITIONS)
+        for neighbor in position.neighbors(map_extent)
+    )
+    assert sorted(zip(sources.tolist(), neighbors)) == expected
+
+
+def test_position_array_flat_indices():
+    map_extent = MapExtent([MapPosition(-1, 0), MapPosition(3, 4)])
+    positions = PositionArray.from_positions(POSITIONS)
+
+    flat_map = np.arange(map_extent.height() * map_extent.width()).reshape(
+        map_extent.height(), map_extent.width()
+    )
+    expected = [flat_map[(position - map_extent.top_left).s_] for position in POSITIONS]
+    assert positions.flat_indices(map_extent).tolist() == expected
+
+
+def test_position_array_manhattan_distances():
+    positions = PositionArray.from_positions(POSITIONS)
+    target = MapPosition(1, 2)
+    assert positions.manhattan_distances(target).tolist() == [
+        ManhattanDistance.between(position, target).distance for position in POSITIONS
+    ]
+
+    others = PositionArray.from_positions(reversed(POSITIONS))
+    assert positions.manhattan_distances(others).tolist() == [
+        ManhattanDistance.between(p1, p2).distance for p1, p2 in zip(POSITIONS, reversed(POSITIONS))
+    ]
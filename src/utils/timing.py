@@ -1,17 +1,311 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sys
+import threading
 import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
 from functools import wraps
+from typing import Dict, Iterator, List, Set, Tuple, Union
+
+import utils.env
+from utils.profiling import profiler
+
+# Setting this environment variable to anything but "" or "0" enables recording of timing spans
+TIMING_ENV = "AOC_TIMING"
+# Path prefix of files written at exit when timing is enabled: <prefix>.json and <prefix>.trace.json
+TIMING_OUTPUT_ENV = "AOC_TIMING_OUTPUT"
+# Enables memory tracking of timed functions (which also enables timing): "1"/"all" for all days, or
+# comma-separated days (e.g. "11,16") for timed functions of these days' modules only
+MEMORY_ENV = "AOC_MEMORY"
+
+# Labels of a span and all its parents, outermost first
+SpanPath = Tuple[str, ...]
+
+
+def _current_rss() -> int:
+    """Resident set size of current process in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Not Linux: fall back to peak RSS
+        import resource
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kB on Linux, bytes on macOS
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@dataclass
+class SpanStats:
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = 0.0
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+
+    def __add__(self, other: SpanStats) -> SpanStats:
+        return SpanStats(
+            count=self.count + other.count,
+            total=self.total + other.total,
+            min=min(self.min, other.min),
+            max=max(self.max, other.max),
+        )
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), "mean": self.mean()}
+
+
+@dataclass
+class MemoryStats:
+    count: int = 0
+    # Maximum over calls of the peak traced memory (bytes) during the span
+    peak: int = 0
+    # Sum over calls of net allocated memory blocks (i.e. blocks still allocated after the span)
+    net_blocks: int = 0
+    # Maximum over calls of the process resident memory growth (bytes) during the span
+    rss_delta: int = 0
+
+    def add(self, peak: int, net_blocks: int, rss_delta: int) -> None:
+        self.count += 1
+        self.peak = max(self.peak, peak)
+        self.net_blocks += net_blocks
+        self.rss_delta = max(self.rss_delta, rss_delta)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class SpanEvent:
+    label: str
+    # Seconds since recorder was reset
+    start: float
+    duration: float
+    thread_id: int
+
+
+class SpanRecorder:
+    """Records nested timing spans. Spans are aggregated by path (i.e. a span's label and those of its
+    parents), and individual events are kept (up to max_events) for exporting as a trace.
+    Spans can also track memory usage (tracemalloc peak, net allocated blocks and RSS growth).
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        memory_days: Union[bool, Set[int]] = False,
+        max_events: int = 1000000,
+    ) -> None:
+        """
+        Args:
+            enabled (bool, optional): Whether spans are recorded. Defaults to False.
+            memory_days (Union[bool, Set[int]], optional): Days for which timed functions also track memory
+                (True for all). Defaults to False.
+            max_events (int, optional): Maximum number of individual events kept for traces. Defaults to 1000000.
+        """
+        self.enabled = enabled or bool(memory_days)
+        self.memory_days = memory_days
+        self.max_events = max_events
+        self.reset()
+
+    def reset(self) -> None:
+        self.spans: Dict[SpanPath, SpanStats] = {}
+        self.memory: Dict[SpanPath, MemoryStats] = {}
+        self.events: List[SpanEvent] = []
+        self.__local = threading.local()
+        self.__origin = time.perf_counter()
+
+    def tracks_memory(self, module: str) -> bool:
+        """Whether timed functions of given module should track memory"""
+        return utils.env.is_enabled_for(self.memory_days, module)
+
+    def __stack(self) -> List[str]:
+        stack = getattr(self.__local, "stack", None)
+        if stack is None:
+            stack = self.__local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, label: str, track_memory: bool = False) -> Iterator[None]:
+        """Context manager recording the duration of its body as a child of the currently open span
+
+        Args:
+            label (str): Span label
+            track_memory (bool, optional): Whether to also record memory usage. tracemalloc's peak is global, so
+                memory is only tracked by the outermost memory tracking span. Defaults to False.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        stack = self.__stack()
+        stack.append(label)
+        path = tuple(stack)
+
+        track_memory = track_memory and not getattr(self.__local, "tracking_memory", False)
+        if track_memory:
+            self.__local.tracking_memory = True
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            start_traced, _ = tracemalloc.get_traced_memory()
+            start_blocks = sys.getallocatedblocks()
+            start_rss = _current_rss()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            self.__record(path, start, duration)
+
+            if track_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                memory_stats = self.memory.get(path)
+                if memory_stats is None:
+                    memory_stats = self.memory[path] = MemoryStats()
+                memory_stats.add(
+                    peak=peak - start_traced,
+                    net_blocks=sys.getallocatedblocks() - start_blocks,
+                    rss_delta=_current_rss() - start_rss,
+                )
+                if started_tracing:
+                    tracemalloc.stop()
+                self.__local.tracking_memory = False
+
+    def __record(self, path: SpanPath, start: float, duration: float) -> None:
+        stats = self.spans.get(path)
+        if stats is None:
+            stats = self.spans[path] = SpanStats()
+        stats.add(duration)
+
+        if len(self.events) < self.max_events:
+            self.events.append(
+                SpanEvent(path[-1], start - self.__origin, duration, threading.get_ident())
+            )
+
+    def label_stats(self) -> Dict[str, SpanStats]:
+        """Stats of each label, regardless of where it was called from"""
+        stats: Dict[str, SpanStats] = {}
+        for path, path_stats in self.spans.items():
+            stats[path[-1]] = stats.get(path[-1], SpanStats()) + path_stats
+        return stats
+
+    def report(self) -> str:
+        """Text report of span tree, children being indented below their parent"""
+        lines = [
+            f"{'span':<60} {'count':>8} {'total':>10} {'min':>10} {'mean':>10} {'max':>10}"
+            f" {'peak MB':>10} {'dRSS MB':>10} {'blocks':>10}"
+        ]
+        # Sorting tuples puts parents right before their children
+        for path in sorted(self.spans):
+            stats = self.spans[path]
+            name = "  " * (len(path) - 1) + path[-1]
+            line = (
+                f"{name:<60} {stats.count:>8} {stats.total:>10.4f} {stats.min:>10.4f}"
+                f" {stats.mean():>10.4f} {stats.max:>10.4f}"
+            )
+            memory_stats = self.memory.get(path)
+            if memory_stats is not None:
+                line += (
+                    f" {memory_stats.peak / 2**20:>10.2f} {memory_stats.rss_delta / 2**20:>10.2f}"
+                    f" {memory_stats.net_blocks:>10}"
+                )
+            lines.append(line)
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict:
+        return {
+            "spans": [
+                {
+                    "path": list(path),
+                    **stats.to_dict(),
+                    **({"memory": self.memory[path].to_dict()} if path in self.memory else {}),
+                }
+                for path, stats in sorted(self.spans.items())
+            ],
+            "labels": {label: stats.to_dict() for label, stats in self.label_stats().items()},
+        }
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def to_chrome_trace(self, path: str) -> None:
+        """Write events in Chrome trace event format (viewable in chrome://tracing or Perfetto)"""
+        pid = os.getpid()
+        trace_events = [
+            {
+                "name": event.label,
+                "cat": "span",
+                "ph": "X",
+                "ts": event.start * 1e6,
+                "dur": event.duration * 1e6,
+                "pid": pid,
+                "tid": event.thread_id,
+            }
+            for event in self.events
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+
+recorder = SpanRecorder(enabled=utils.env.flag(TIMING_ENV), memory_days=utils.env.days(MEMORY_ENV))
+
+
+def span(label: str, track_memory: bool = False):
+    """Record duration (and optionally memory usage) of a code block with the module recorder
+
+    e.g.
+        with utils.timing.span("build graph"):
+            ...
+    """
+    return recorder.span(label, track_memory=track_memory)
 
 
 def timing(f):
-    """Function timing decorator"""
+    """Function timing decorator. Calls are recorded as spans by the module recorder when enabled
+    (see TIMING_ENV), otherwise the only overhead is checking whether it is enabled. Memory usage is also
+    recorded if enabled for the function's day (see MEMORY_ENV), and calls are profiled if profiling is
+    enabled for it (see utils.profiling.PROFILE_ENV).
+    """
+    label = f"{f.__module__}.{f.__qualname__}"
 
     @wraps(f)
     def wrap(*args, **kw):
-        ts = time.perf_counter()
-        result = f(*args, **kw)
-        te = time.perf_counter()
-        # if te - ts > 0.0001:
-        print(f"Function {f.__name__} took {te-ts:2.4f} seconds")
-        return result
+        if not (recorder.enabled or profiler.enabled):
+            return f(*args, **kw)
+        profile = profiler.profile(label) if profiler.profiles(f.__module__) else nullcontext()
+        with recorder.span(label, track_memory=recorder.tracks_memory(f.__module__)), profile:
+            return f(*args, **kw)
 
     return wrap
+
+
+def _report_at_exit() -> None:
+    if not recorder.spans:
+        return
+    print(recorder.report())
+    output = os.environ.get(TIMING_OUTPUT_ENV)
+    if output:
+        recorder.to_json(f"{output}.json")
+        recorder.to_chrome_trace(f"{output}.trace.json")
+
+
+atexit.register(_report_at_exit)